@@ -0,0 +1,16 @@
+"""Tax engine benchmarks with a throughput regression gate.
+
+Run from the repository root:
+
+    python -m backend.benchmarks                    # run, write results, compare to baseline
+    python -m backend.benchmarks --save-baseline    # record the current numbers as the baseline
+
+Micro benchmarks time `compare_regimes` and `generate_optimization_suggestions`
+over a seeded synthetic population; the end-to-end benchmark drives
+`POST /api/filings/{id}/calculate` through the ASGI app against a throwaway
+SQLite database. The process exits non-zero when any benchmark's throughput
+falls more than `--threshold` below the baseline. Baselines are machine
+specific — record one on the machine that runs the gate. The baseline stores
+the machine type, Python and numpy versions it was recorded with; when they
+differ from the running ones the gate refuses to compare and exits with 2.
+"""
@@ -0,0 +1,124 @@
+"""Command-line entry point — see the package docstring."""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import tempfile
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# A baseline is only comparable on the same machine type and numerical stack
+ENVIRONMENT_KEYS = ("machine", "python", "numpy")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks", description=__doc__)
+    parser.add_argument("--size", type=int, default=5000, help="taxpayers per micro-benchmark round")
+    parser.add_argument("--e2e-size", type=int, default=300, help="filings per end-to-end round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed fractional throughput drop before failing (default 0.15)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline and exit")
+    return parser.parse_args()
+
+
+def _compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a comparison table; return the names of regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':<18}{'ops/s':>12}{'baseline':>12}{'change':>9}   p50 µs    p95 µs")
+    for name, current in results.items():
+        base = baseline.get(name)
+        if base is None:
+            change, verdict = "", "new"
+        else:
+            ratio = current["ops_per_sec"] / base["ops_per_sec"]
+            change = f"{ratio - 1:+.1%}"
+            verdict = "REGRESSED" if ratio < 1 - threshold else "ok"
+            if verdict == "REGRESSED":
+                regressions.append(name)
+        print(
+            f"{name:<18}{current['ops_per_sec']:>12,.0f}"
+            f"{base['ops_per_sec'] if base else 0:>12,.0f}{change:>9}"
+            f"{current['p50_us']:>9,.1f} {current['p95_us']:>9,.1f}   {verdict}"
+        )
+    return regressions
+
+
+def _environment_mismatch(current: dict, recorded: dict) -> list[str]:
+    """`key: recorded != current` for each environment field the baseline does not share."""
+    mismatches = []
+    for key in ENVIRONMENT_KEYS:
+        ours, theirs = current[key], recorded.get(key)
+        if key == "python":  # patch releases do not move these numbers
+            ours, theirs = ours.rsplit(".", 1)[0], theirs and theirs.rsplit(".", 1)[0]
+        if ours != theirs:
+            mismatches.append(f"{key}: baseline {recorded.get(key)} != {current[key]}")
+    return mismatches
+
+
+def main() -> int:
+    args = _parse_args()
+
+    # The app reads its settings at import time — point it at a scratch database first.
+    scratch = tempfile.TemporaryDirectory(prefix="taxexpert-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch.name}/bench.db"
+    os.environ["DEBUG"] = "false"
+    os.environ["UPLOAD_DIR"] = f"{scratch.name}/uploads"
+
+    import numpy as np
+    from backend.benchmarks.suite import run_suite
+
+    environment = {"machine": platform.machine(), "python": platform.python_version(), "numpy": np.__version__}
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        mismatches = _environment_mismatch(environment, baseline.get("meta", {}))
+        if mismatches:  # checked up front — no point running the suite
+            print(f"Baseline {args.baseline} was recorded in a different environment; not comparing:")
+            for mismatch in mismatches:
+                print(f"  {mismatch}")
+            print("Re-record it here with --save-baseline, or run where it was recorded.")
+            return 2
+
+    with scratch:
+        results = asyncio.run(run_suite(args.size, args.rounds, args.e2e_size))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **environment,
+            "size": args.size,
+            "e2e_size": args.e2e_size,
+            "rounds": args.rounds,
+        },
+        "benchmarks": {name: asdict(result) for name, result in results.items()},
+    }
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"Results written to {args.output}")
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+    regressions = _compare(report["benchmarks"], baseline["benchmarks"], args.threshold)
+    if regressions:
+        print(f"\nThroughput regressed more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Synthetic taxpayer population for benchmarks.
+
+Salaries are log-normal around ₹9L with a fat tail of high earners spread
+across every surcharge band; deductions are drawn per taxpayer from a few
+typical mixes (salaried with HRA, home-loan borrowers, maxed-out investors,
+new-regime filers claiming almost nothing). Seeded, so runs are comparable.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from backend.schemas.filing import DeductionData, IncomeData
+
+# (lower, upper) salary ranges for the high-earner tail — one per surcharge band and above
+_HIGH_EARNER_BANDS = [
+    (5_000_000, 10_000_000),
+    (10_000_000, 20_000_000),
+    (20_000_000, 50_000_000),
+    (50_000_000, 120_000_000),
+]
+
+
+@dataclass(slots=True)
+class Taxpayer:
+    income: IncomeData
+    deductions: DeductionData
+    tds_paid: float
+
+
+def _deductions(rng: np.random.Generator, salary: float) -> DeductionData:
+    mix = rng.choice(["minimal", "salaried", "home_loan", "maxed"], p=[0.3, 0.35, 0.2, 0.15])
+    if mix == "minimal":
+        return DeductionData()
+    deductions = {
+        "section_80c": float(rng.integers(20_000, 150_001)),
+        "hra_exemption": float(min(salary * 0.2, rng.integers(0, 400_001))),
+        "section_80d": float(rng.choice([0, 25_000])),
+    }
+    if mix == "home_loan":
+        deductions["home_loan_interest"] = float(rng.integers(50_000, 200_001))
+    if mix == "maxed":
+        deductions.update(section_80c=150_000.0, section_80ccd_1b=50_000.0, section_80d=25_000.0)
+        deductions["section_80g"] = float(rng.integers(0, 50_001))
+    return DeductionData(**deductions)
+
+
+def generate_population(size: int, seed: int = 2025) -> list[Taxpayer]:
+    """`size` taxpayers; about 5% earn above ₹50L and attract surcharge."""
+    rng = np.random.default_rng(seed)
+    population = []
+    for _ in range(size):
+        if rng.random() < 0.05:
+            low, high = _HIGH_EARNER_BANDS[rng.integers(len(_HIGH_EARNER_BANDS))]
+            salary = float(rng.integers(low, high))
+        else:
+            salary = float(np.clip(rng.lognormal(np.log(900_000), 0.6), 0, 5_000_000).round())
+        income = IncomeData(
+            salary=salary,
+            other_income=float(rng.integers(0, 100_001)) if rng.random() < 0.5 else 0.0,
+            house_property=float(rng.integers(0, 300_001)) if rng.random() < 0.1 else 0.0,
+            capital_gains_short=float(rng.integers(0, 500_001)) if rng.random() < 0.1 else 0.0,
+        )
+        tds_paid = float(round(salary * rng.uniform(0, 0.25)))
+        population.append(Taxpayer(income, _deductions(rng, salary), tds_paid))
+    return population
@@ -0,0 +1,123 @@
+"""Cold-start benchmark: import time, startup (lifespan) time and first-request latency.
+
+Run from the repository root:
+
+    python -m backend.benchmarks.startup [--rounds 5] [--output startup-results.json]
+
+Every measurement is a fresh interpreter, so nothing is warm in-process.
+Each round boots twice against a new scratch SQLite database: "fresh" creates
+the schema, "existing" finds it current — the usual case for a restarted
+worker. Reports the median of each phase in milliseconds, and how much of
+the import each router adds (modules it pulls in that earlier routers did not),
+which shows where deferring an import would actually shorten a cold start.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PHASES = ("import_ms", "startup_ms", "first_request_ms")
+ROUTERS = ("auth", "users", "filings", "documents", "admin", "tax")  # import order in backend.main
+
+
+async def _boot() -> dict[str, float]:
+    """Child process: time the app import, its lifespan startup and one authenticated request."""
+    clock = time.perf_counter
+    start = clock()
+    routers = {}
+    for name in ROUTERS:
+        router_start = clock()
+        importlib.import_module(f"backend.routers.{name}")
+        routers[name] = (clock() - router_start) * 1000
+    from backend.main import app
+    imported = clock()
+
+    async with app.router.lifespan_context(app):
+        started = clock()
+
+        from backend.benchmarks.suite import _request
+        from backend.database import async_session
+        from backend.models.user import User
+        from backend.utils.security import create_access_token
+
+        async with async_session() as session:
+            user = User(email=f"boot-{time.time_ns()}@example.com", password_hash="!", full_name="Boot")
+            session.add(user)
+            await session.commit()
+        headers = [(b"authorization", f"Bearer {create_access_token({'sub': user.id})}".encode())]
+
+        request_start = clock()
+        status, _ = await _request("GET", "/api/filings/", headers)
+        finished = clock()
+        if status != 200:
+            raise RuntimeError(f"GET /api/filings/ returned {status}")
+
+    return {
+        "import_ms": (imported - start) * 1000,
+        "startup_ms": (started - imported) * 1000,
+        "first_request_ms": (finished - request_start) * 1000,
+        "routers_ms": routers,
+    }
+
+
+def _run_child(database_url: str, upload_dir: str) -> dict[str, float]:
+    env = {**os.environ, "DATABASE_URL": database_url, "DEBUG": "false", "UPLOAD_DIR": upload_dir}
+    out = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.startup", "--child"],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def run_startup(rounds: int) -> dict[str, dict[str, float]]:
+    samples: dict[str, list[dict]] = {"fresh": [], "existing": []}
+    for _ in range(rounds):
+        with tempfile.TemporaryDirectory(prefix="taxexpert-boot-") as scratch:
+            url = f"sqlite+aiosqlite:///{scratch}/boot.db"
+            samples["fresh"].append(_run_child(url, f"{scratch}/uploads"))
+            samples["existing"].append(_run_child(url, f"{scratch}/uploads"))
+    results = {
+        case: {phase: round(statistics.median(s[phase] for s in runs), 1) for phase in PHASES}
+        for case, runs in samples.items()
+    }
+    every_boot = samples["fresh"] + samples["existing"]
+    results["routers_ms"] = {
+        name: round(statistics.median(s["routers_ms"][name] for s in every_boot), 1) for name in ROUTERS
+    }
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.startup", description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="also write the results as JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(_boot())))
+        return 0
+
+    results = run_startup(args.rounds)
+    print(f"\n{'database':<10}" + "".join(f"{phase:>18}" for phase in PHASES))
+    for case in ("fresh", "existing"):
+        print(f"{case:<10}" + "".join(f"{results[case][phase]:>18,.1f}" for phase in PHASES))
+    print(f"\n{'router':<10}{'adds to import_ms':>18}")
+    for name, ms in results["routers_ms"].items():
+        print(f"{name:<10}{ms:>18,.1f}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
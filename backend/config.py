@@ -10,6 +10,18 @@ class Settings(BaseSettings):
     # Database (SQLite for dev, set env var for PostgreSQL in production)
     DATABASE_URL: str = "sqlite+aiosqlite:///./taxexpert.db"
 
+    # Connection pool — unset values take the per-backend defaults in database.py
+    DB_POOL_SIZE: int | None = None
+    DB_MAX_OVERFLOW: int | None = None
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int | None = None  # seconds before a connection is replaced (-1 = never)
+    DB_POOL_PRE_PING: bool | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection (0 behind PgBouncer)
+
+    # SQL instrumentation — requests over these limits are logged and counted in /api/admin/metrics
+    SQL_QUERY_BUDGET: int = 15  # statements per request (0 = no limit)
+    SQL_REPEAT_LIMIT: int = 5  # runs of one identical statement per request, a likely N+1 (0 = no limit)
+
     # CORS
     CORS_ORIGINS: str = ""
 
@@ -17,10 +29,37 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "taxexpert-dev-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    AUTH_CACHE_SIZE: int = 10_000  # verified tokens / user rows kept in memory
+    AUTH_CACHE_TTL: float = 60.0  # seconds before a cached user row is re-read
+    PASSWORD_HASH_WORKERS: int = 2  # threads running bcrypt
+    PASSWORD_HASH_QUEUE: int = 32  # bcrypt calls allowed to wait before returning 503
+
+    # Admin stats — counters are recomputed from the tables this often (seconds)
+    STATS_RECONCILE_INTERVAL: float = 3600
 
     # File uploads
     UPLOAD_DIR: str = "./uploads"
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10 MB
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # bytes buffered per write to disk while streaming an upload
+    UPLOAD_BATCH_MAX_FILES: int = 20  # files per POST /api/documents/batch (frontend/api.js checks the same)
+    MAX_BATCH_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50 MB across a batch's files
+    UPLOAD_BATCH_CONCURRENCY: int = 4  # a batch's files moved into the blob store at once
+
+    # Document parsing — background pipeline filling Document.parsed_data
+    PARSE_POOL_WORKERS: int = 1  # parser processes (one document each at a time)
+    PARSE_QUEUE_SIZE: int = 256  # documents waiting; uploads beyond this are left to the sweep
+    PARSE_TIMEOUT: float = 60.0  # seconds per document before the attempt counts as failed
+    PARSE_MAX_ATTEMPTS: int = 3  # tries after a crash or timeout
+    PARSE_RETRY_DELAY: float = 10.0  # seconds before the first retry, doubled for each further one
+    PARSE_SWEEP_INTERVAL: float = 300  # seconds between scans for unparsed documents
+
+    # Tax engine
+    BATCH_MAX_ROWS: int = 100_000  # max filings per /batch-calculate call
+    TAX_CACHE_SIZE: int = 4096  # in-process LRU of regime comparisons by fingerprint
+    SWEEP_MAX_POINTS: int = 10_000  # max grid points per /api/tax/sweep call
+    ENGINE_POOL_WORKERS: int = 0  # batch-engine worker processes (0 = one per CPU core)
+    ENGINE_INLINE_MAX_ROWS: int = 5_000  # smaller batches run on the event loop
+    ENGINE_CHUNK_ROWS: int = 25_000  # rows per worker task
 
     class Config:
         env_file = ".env"
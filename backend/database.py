@@ -1,9 +1,17 @@
 """Database engine and session management."""
 
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from backend.config import settings
+from backend.utils.metrics import metrics
 
 # Render provides DATABASE_URL as "postgres://..." or "postgresql://..."
 # We need "postgresql+asyncpg://..." for async, or keep sqlite for dev
@@ -13,9 +21,130 @@ if db_url.startswith("postgres://"):
 elif db_url.startswith("postgresql://"):
     db_url = db_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_async_engine(db_url, echo=settings.DEBUG)
+# Per-backend pool defaults, overridden by the DB_POOL_* settings. SQLite gets a
+# small pool too — SQLAlchemy's default for file databases opens (and threads)
+# a fresh aiosqlite connection for every session.
+_POOL_DEFAULTS = {
+    "postgresql": {"pool_size": 10, "max_overflow": 10, "pool_recycle": 1800, "pool_pre_ping": True},
+    "sqlite": {"pool_size": 5, "max_overflow": 5, "pool_recycle": -1, "pool_pre_ping": False},
+}
+
+
+class _TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited (including connects)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.inc("db.pool.timeouts")
+            raise
+        finally:
+            metrics.observe("db.pool.wait", time.perf_counter() - start)
+
+
+def _engine_options(url: str) -> dict:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options = {"echo": settings.DEBUG}
+    if backend == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options  # in-memory: one shared connection (StaticPool)
+
+    defaults = _POOL_DEFAULTS.get(backend, _POOL_DEFAULTS["postgresql"])
+    overrides = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    options.update(defaults)
+    options.update({key: value for key, value in overrides.items() if value is not None})
+    options.update(poolclass=_TimedQueuePool, pool_timeout=settings.DB_POOL_TIMEOUT)
+
+    if parsed.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        if settings.DB_STATEMENT_CACHE_SIZE == 0:
+            # PgBouncer (transaction mode) also needs asyncpg's own cache off
+            options["connect_args"]["statement_cache_size"] = 0
+    return options
+
+
+engine = create_async_engine(db_url, **_engine_options(db_url))
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Read-only handlers run in autocommit mode on the same pool: no BEGIN, COMMIT
+# or ROLLBACK round trips, and no autoflush since nothing is ever written.
+# SQLite's driver only opens a transaction before a write, so there the session
+# stays in the default mode (autocommit would only add a PRAGMA per checkout to
+# restore the isolation level) and simply never commits.
+read_session = async_sessionmaker(
+    engine if engine.dialect.name == "sqlite" else engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession, expire_on_commit=False, autoflush=False,
+)
+
+
+def pool_stats() -> dict[str, float]:
+    """Current pool occupancy, reported as gauges by the metrics registry."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {}
+    return {
+        "db.pool.size": pool.size(),
+        "db.pool.checked_out": pool.checkedout(),
+        "db.pool.checked_in": pool.checkedin(),
+        "db.pool.overflow": max(0, pool.overflow()),
+    }
+
+
+metrics.add_collector(pool_stats)
+
+
+# ─── Per-request SQL statistics ───
+
+class QueryStats:
+    """Statements run on behalf of one request (see utils/sql_stats.py)."""
+
+    __slots__ = ("count", "total", "slowest", "slowest_statement", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = ""
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds >= self.slowest:
+            self.slowest = seconds
+            self.slowest_statement = statement
+        self.statements[statement] += 1
+
+    def most_repeated(self) -> tuple[str, int]:
+        """The statement run most often and how many times ("", 0 if none)."""
+        return self.statements.most_common(1)[0] if self.statements else ("", 0)
+
+
+# Set per request by the middleware. SQLAlchemy runs the sync engine events in a
+# greenlet that inherits the caller's context, so the hooks below see it.
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    context._statement_start = time.perf_counter()
+
+
+@event.listens_for(engine.sync_engine, "after_cursor_execute")
+def _end_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._statement_start
+    metrics.observe("db.statement", elapsed)
+    stats = query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
 
 class Base(DeclarativeBase):
     pass
@@ -32,10 +161,14 @@ async def get_db():
             raise
 
 
+async def get_read_db():
+    """Dependency that yields a session for handlers that only read."""
+    async with read_session() as session:
+        yield session
+
+
 async def init_db():
-    """Create all tables on startup."""
+    """Create or upgrade the schema on startup (a version check when it is current)."""
+    from backend.migrations import upgrade
     async with engine.begin() as conn:
-        from backend.models.user import User  # noqa: F401
-        from backend.models.filing import Filing  # noqa: F401
-        from backend.models.document import Document  # noqa: F401
-        await conn.run_sync(Base.metadata.create_all)
+        await upgrade(conn)
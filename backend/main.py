@@ -1,20 +1,33 @@
 """TaxExpert AI — FastAPI Application Entry Point."""
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
 from backend.database import init_db
-from backend.routers import auth, users, filings, documents, admin
+from backend.routers import auth, users, filings, documents, admin, tax
+from backend.services import parsing
+from backend.services.executor import shutdown_pool
+from backend.services.stats import reconcile_periodically
+from backend.utils.pagination import NEXT_CURSOR_HEADER
+from backend.utils.sql_stats import SQL_STATS_HEADERS, SQLStatsMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup / shutdown events."""
     await init_db()
+    reconciler = asyncio.create_task(reconcile_periodically(settings.STATS_RECONCILE_INTERVAL))
+    parsing.start()
     yield
+    await parsing.stop()
+    reconciler.cancel()
+    with suppress(asyncio.CancelledError):
+        await reconciler
+    shutdown_pool()
 
 
 app = FastAPI(
@@ -24,6 +37,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Query count / DB time per request (headers in DEBUG, metrics always)
+app.add_middleware(SQLStatsMiddleware)
+
 # CORS — allow frontend (dev + production)
 cors_origins = settings.CORS_ORIGINS.split(",") if settings.CORS_ORIGINS else []
 cors_origins += ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -33,12 +49,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Content-Range", "Content-Disposition", *SQL_STATS_HEADERS],
 )
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(users.router)
 app.include_router(filings.router)
+app.include_router(tax.router)
 app.include_router(documents.router)
 app.include_router(admin.router)
 
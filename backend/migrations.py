@@ -0,0 +1,141 @@
+"""Schema versioning — what `init_db` runs at startup.
+
+The `schema_version` table records how far a database has been migrated. On
+a current database startup costs two small queries (does the table exist,
+what does it say) instead of `create_all` checking every table and enum.
+Otherwise:
+
+- an empty database gets `create_all` and is stamped with `SCHEMA_VERSION`;
+- a database from before versioning (tables but no `schema_version`) starts
+  at version 0; one behind runs the steps it is missing.
+
+New tables always come from `create_all`, which runs on every upgrade;
+`MIGRATIONS` only changes tables that already exist. Steps must tolerate a
+database whose tables `create_all` made after the change landed in the
+models (e.g. the column is already there).
+"""
+
+from typing import Awaitable, Callable
+
+from sqlalchemy import Column, Index, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.schema import CreateColumn
+
+from backend.database import Base
+from backend.models.schema_version import SchemaVersion
+from backend.utils.metrics import metrics
+
+SCHEMA_VERSION = 6
+
+# Core table — the startup check stays clear of ORM mapper configuration
+_schema_version = SchemaVersion.__table__
+
+# Serialises concurrent upgrades from several workers (Postgres only)
+_ADVISORY_LOCK_ID = 0x7A5E_0001
+
+
+def _import_models():
+    from backend.models.user import User  # noqa: F401
+    from backend.models.filing import Filing  # noqa: F401
+    from backend.models.document import Document  # noqa: F401
+    from backend.models.stat_counter import StatCounter  # noqa: F401
+    from backend.models.blob import Blob  # noqa: F401
+
+
+async def _add_column(conn: AsyncConnection, column: Column):
+    """ALTER TABLE ... ADD COLUMN for a model column, unless the table already has it."""
+    table = column.table.name
+    existing = await conn.run_sync(lambda sync: {c["name"] for c in inspect(sync).get_columns(table)})
+    if column.name not in existing:
+        spec = CreateColumn(column).compile(dialect=conn.dialect)
+        await conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {spec}"))
+
+
+async def _create_index(conn: AsyncConnection, index: Index):
+    await conn.run_sync(lambda sync: index.create(sync, checkfirst=True))
+
+
+# ─── Steps (key = the version each one produces) ───
+
+async def _add_computation_fingerprint(conn: AsyncConnection):
+    from backend.models.filing import Filing
+    await _add_column(conn, Filing.__table__.c.computation_fingerprint)
+
+
+async def _add_listing_indexes(conn: AsyncConnection):
+    names = {"ix_users_created", "ix_filings_user_created", "ix_filings_created", "ix_documents_user_uploaded"}
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in names:
+                await _create_index(conn, index)
+
+
+async def _add_filing_version(conn: AsyncConnection):
+    from backend.models.filing import Filing
+    await _add_column(conn, Filing.__table__.c.version)
+
+
+async def _seed_stat_counters(conn: AsyncConnection):
+    from backend.services import stats
+    async with AsyncSession(bind=conn) as db:
+        await stats.reconcile(db)
+
+
+async def _add_document_sha256(conn: AsyncConnection):
+    from backend.models.document import Document
+    await _add_column(conn, Document.__table__.c.sha256)
+
+
+async def _index_document_sha256(conn: AsyncConnection):
+    for index in Base.metadata.tables["documents"].indexes:
+        if index.name == "ix_documents_sha256":
+            await _create_index(conn, index)
+
+
+MIGRATIONS: dict[int, Callable[[AsyncConnection], Awaitable[None]]] = {
+    1: _add_computation_fingerprint,
+    2: _add_listing_indexes,
+    3: _add_filing_version,
+    4: _seed_stat_counters,
+    5: _add_document_sha256,
+    6: _index_document_sha256,  # the blobs table itself comes from create_all
+}
+
+
+# ─── Runner ───
+
+async def _stored_version(conn: AsyncConnection) -> int | None:
+    """The recorded version, 0 for an unversioned database with tables, None for an empty one."""
+    tables = await conn.run_sync(lambda sync: inspect(sync).get_table_names())
+    if _schema_version.name in tables:
+        return await conn.scalar(select(_schema_version.c.version)) or 0
+    return 0 if "users" in tables else None
+
+
+async def upgrade(conn: AsyncConnection):
+    """Bring the database on `conn` up to `SCHEMA_VERSION` (inside the caller's transaction)."""
+    version = await _stored_version(conn)
+    if version == SCHEMA_VERSION:
+        return
+    if conn.dialect.name == "postgresql":
+        # Another worker may be upgrading right now — wait for it, then look again
+        await conn.execute(text(f"SELECT pg_advisory_xact_lock({_ADVISORY_LOCK_ID})"))
+        version = await _stored_version(conn)
+        if version == SCHEMA_VERSION:
+            return
+    if version is not None and version > SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema version {version} is newer than this code ({SCHEMA_VERSION})")
+
+    _import_models()
+    await conn.run_sync(Base.metadata.create_all)
+    if version is None:
+        await conn.execute(_schema_version.insert().values(version=SCHEMA_VERSION))
+        return
+    for target in range(version + 1, SCHEMA_VERSION + 1):
+        await MIGRATIONS[target](conn)
+        metrics.inc("db.migrations")
+    # create_all made the table (empty) if this database predates versioning
+    if await conn.scalar(select(_schema_version.c.version)) is None:
+        await conn.execute(_schema_version.insert().values(version=SCHEMA_VERSION))
+    else:
+        await conn.execute(_schema_version.update().values(version=SCHEMA_VERSION))
@@ -0,0 +1,21 @@
+"""Blob SQLAlchemy model."""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class Blob(Base):
+    """Stored file content, shared by every Document with the same SHA-256 (see `services.blobs`)."""
+
+    __tablename__ = "blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    refcount: Mapped[int] = mapped_column(Integer, nullable=False, default=1)  # Document rows using it
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
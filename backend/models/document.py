@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, ForeignKey, JSON, Enum as SAEnum
+from sqlalchemy import String, DateTime, ForeignKey, Index, JSON, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
@@ -11,6 +11,9 @@ from backend.database import Base
 
 class Document(Base):
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_user_uploaded", "user_id", "uploaded_at", "id"),  # keyset pagination
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -26,6 +29,8 @@ class Document(Base):
     file_path: Mapped[str] = mapped_column(String(512), nullable=False)
     file_size: Mapped[int | None] = mapped_column(nullable=True)
     mime_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    # Hex digest of the file — the key of its blob in services.blobs
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     parsed_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     uploaded_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
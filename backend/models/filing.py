@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, Float, ForeignKey, JSON, Enum as SAEnum
+from sqlalchemy import String, DateTime, Float, ForeignKey, Index, Integer, JSON, Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database import Base
@@ -11,6 +11,11 @@ from backend.database import Base
 
 class Filing(Base):
     __tablename__ = "filings"
+    __table_args__ = (
+        # Keyset pagination: per-user listing and the admin listing
+        Index("ix_filings_user_created", "user_id", "created_at", "id"),
+        Index("ix_filings_created", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(
         String(36), primary_key=True, default=lambda: str(uuid.uuid4())
@@ -36,6 +41,8 @@ class Filing(Base):
     income_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     deduction_data: Mapped[dict | None] = mapped_column(JSON, nullable=True)
     tax_computation: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # SHA-256 of the inputs tax_computation was computed from (see tax_engine.computation_fingerprint)
+    computation_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     # Calculated results
     total_income: Mapped[float] = mapped_column(Float, default=0.0)
@@ -43,6 +50,9 @@ class Filing(Base):
     tds_paid: Mapped[float] = mapped_column(Float, default=0.0)
     refund: Mapped[float] = mapped_column(Float, default=0.0)
 
+    # Bumped by every write to the editable fields; sent as the ETag for If-Match
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
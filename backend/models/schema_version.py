@@ -0,0 +1,14 @@
+"""Schema version SQLAlchemy model."""
+
+from sqlalchemy import Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class SchemaVersion(Base):
+    """Single row holding the migration level of this database (see `backend.migrations`)."""
+
+    __tablename__ = "schema_version"
+
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -0,0 +1,15 @@
+"""Stat counter SQLAlchemy model."""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.database import Base
+
+
+class StatCounter(Base):
+    """One named running count (e.g. "filings.status.draft"), kept by `services.stats`."""
+
+    __tablename__ = "stat_counters"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
@@ -4,17 +4,19 @@ These endpoints let you inspect the database contents.
 Protected by a simple admin check (role == 'admin').
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database import get_db
+from backend.database import get_db, get_read_db
 from backend.models.user import User
 from backend.models.filing import Filing
-from backend.models.document import Document
 from backend.schemas.user import UserResponse
-from backend.schemas.filing import FilingResponse
-from backend.utils.security import get_current_user
+from backend.schemas.filing import FilingSummary
+from backend.services.stats import read_stats
+from backend.utils.metrics import metrics
+from backend.utils.pagination import PageParams, page_rows, paginate
+from backend.utils.security import get_current_user, invalidate_user
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
@@ -30,43 +32,45 @@ async def require_admin(current_user: User = Depends(get_current_user)):
 @router.get("/stats")
 async def get_stats(
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get system-wide statistics."""
-    user_count = await db.scalar(select(func.count(User.id)))
-    filing_count = await db.scalar(select(func.count(Filing.id)))
-    doc_count = await db.scalar(select(func.count(Document.id)))
-    submitted = await db.scalar(
-        select(func.count(Filing.id)).where(Filing.status.in_(["submitted", "filed"]))
-    )
-    return {
-        "total_users": user_count,
-        "total_filings": filing_count,
-        "total_documents": doc_count,
-        "submitted_filings": submitted,
-    }
+    """Get system-wide statistics (from maintained counters, with per-status/regime/ITR breakdowns)."""
+    return await read_stats(db)
+
+
+# ─── Runtime Metrics ───
+@router.get("/metrics")
+async def get_metrics(admin: User = Depends(require_admin)):
+    """In-process counters, gauges and timers (engine pool queue depth, etc.)."""
+    return metrics.snapshot()
 
 
 # ─── List All Users ───
 @router.get("/users", response_model=list[UserResponse])
 async def list_all_users(
+    response: Response,
+    page: PageParams = Depends(),
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List all registered users."""
-    result = await db.execute(select(User).order_by(User.created_at.desc()))
-    return [UserResponse.model_validate(u) for u in result.scalars().all()]
+    """List registered users, newest first (see X-Next-Cursor for more)."""
+    stmt = select(*(getattr(User, field) for field in UserResponse.model_fields))
+    rows = page_rows((await db.execute(paginate(stmt, User.created_at, User.id, page))).all(), page, response, "created_at")
+    return [UserResponse.model_validate(row) for row in rows]
 
 
 # ─── List All Filings ───
-@router.get("/filings", response_model=list[FilingResponse])
+@router.get("/filings", response_model=list[FilingSummary])
 async def list_all_filings(
+    response: Response,
+    page: PageParams = Depends(),
     admin: User = Depends(require_admin),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """List all filings across all users."""
-    result = await db.execute(select(Filing).order_by(Filing.created_at.desc()))
-    return [FilingResponse.model_validate(f) for f in result.scalars().all()]
+    """List filings across all users, newest first (summaries; see X-Next-Cursor for more)."""
+    stmt = select(*(getattr(Filing, field) for field in FilingSummary.model_fields))
+    rows = page_rows((await db.execute(paginate(stmt, Filing.created_at, Filing.id, page))).all(), page, response, "created_at")
+    return [FilingSummary.model_validate(row) for row in rows]
 
 
 # ─── Promote User to Admin ───
@@ -83,5 +87,6 @@ async def promote_to_admin(
         raise HTTPException(status_code=404, detail="User not found")
     user.role = "admin"
     db.add(user)
-    await db.flush()
+    await db.commit()  # before dropping the cached row, so no request re-caches the old one
+    invalidate_user(user.id)
     return {"message": f"{user.full_name} promoted to admin"}
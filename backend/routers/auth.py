@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.database import get_db
 from backend.models.user import User
 from backend.schemas.user import UserRegister, UserLogin, TokenResponse, UserResponse
+from backend.services import stats
 from backend.utils.security import hash_password, verify_password, create_access_token, get_current_user
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -20,15 +21,20 @@ async def register(data: UserRegister, db: AsyncSession = Depends(get_db)):
     if result.scalar_one_or_none():
         raise HTTPException(status_code=400, detail="Email already registered")
 
+    # End the read transaction so no pooled connection is held while bcrypt queues
+    await db.commit()
+    password_hash = await hash_password(data.password)
+
     user = User(
         email=data.email,
-        password_hash=hash_password(data.password),
+        password_hash=password_hash,
         full_name=data.full_name,
         phone=data.phone,
     )
     db.add(user)
     await db.flush()
     await db.refresh(user)
+    await stats.bump(db, {"users": 1})
 
     token = create_access_token({"sub": user.id})
     return TokenResponse(
@@ -42,8 +48,9 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login with email and password."""
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
+    await db.commit()  # release the connection while bcrypt queues
 
-    if not user or not verify_password(data.password, user.password_hash):
+    if not user or not await verify_password(data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     token = create_access_token({"sub": user.id})
@@ -1,72 +1,167 @@
 """Document upload and management API routes."""
 
-import os
-import uuid
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
-from sqlalchemy import select
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.config import settings
-from backend.database import get_db
+from backend.database import get_db, get_read_db
 from backend.models.user import User
 from backend.models.document import Document
-from backend.schemas.document import DocumentResponse
+from backend.schemas.document import DocumentResponse, DocumentSummary
+from backend.services import blobs, parsing, stats
+from backend.services.document_parser import PARSEABLE_DOC_TYPES
+from backend.utils.pagination import PageParams, page_rows, paginate
+from backend.utils.downloads import file_response
 from backend.utils.security import get_current_user
+from backend.utils.uploads import BATCH_UPLOAD_OPENAPI, UPLOAD_OPENAPI, receive_upload, receive_uploads
 
 router = APIRouter(prefix="/api/documents", tags=["Documents"])
 
 
-@router.post("/", response_model=DocumentResponse, status_code=201)
+@router.post("/", response_model=DocumentResponse, status_code=201, openapi_extra=UPLOAD_OPENAPI)
 async def upload_document(
-    file: UploadFile = File(...),
-    doc_type: str = Form(default="other"),
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Upload a tax document (Form 16, bank statement, etc.)."""
-    # Validate file size
-    contents = await file.read()
-    if len(contents) > settings.MAX_UPLOAD_SIZE:
-        raise HTTPException(status_code=413, detail="File too large (max 10MB)")
-
-    # Save file to disk
-    upload_dir = os.path.join(settings.UPLOAD_DIR, current_user.id)
-    os.makedirs(upload_dir, exist_ok=True)
-
-    ext = os.path.splitext(file.filename)[1] if file.filename else ""
-    saved_filename = f"{uuid.uuid4()}{ext}"
-    file_path = os.path.join(upload_dir, saved_filename)
-
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    """Upload a tax document (Form 16, bank statement, etc.).
+
+    Multipart form with `file` and optional `doc_type`. The file is streamed
+    to disk and hashed as it arrives; anything over MAX_UPLOAD_SIZE is
+    rejected with 413 without reading the rest. Content that is already
+    stored (same SHA-256) is kept once and shared. Form 16s and salary
+    slips are parsed in the background once the upload is committed; the
+    result appears in `parsed_data` (see GET /{doc_id}).
+    """
+    upload = await receive_upload(request, blobs.UPLOAD_TEMP_DIR)
+    file_path = await blobs.store(db, upload)
 
     doc = Document(
         user_id=current_user.id,
-        doc_type=doc_type,
-        filename=file.filename or "unknown",
+        doc_type=upload.fields.get("doc_type", "other"),
+        filename=upload.filename or "unknown",
         file_path=file_path,
-        file_size=len(contents),
-        mime_type=file.content_type,
+        file_size=upload.size,
+        mime_type=upload.content_type,
+        sha256=upload.sha256,
     )
     db.add(doc)
     await db.flush()
     await db.refresh(doc)
+    await stats.bump(db, {"documents": 1})
+    if doc.doc_type in PARSEABLE_DOC_TYPES:
+        background_tasks.add_task(parsing.enqueue, doc.id)  # runs after the commit
     return DocumentResponse.model_validate(doc)
 
 
-@router.get("/", response_model=list[DocumentResponse])
-async def list_documents(
+@router.post("/batch", response_model=list[DocumentResponse], status_code=201, openapi_extra=BATCH_UPLOAD_OPENAPI)
+async def upload_documents(
+    request: Request,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all documents for the current user."""
+    """Upload several documents of one type in a single request.
+
+    Multipart form with up to UPLOAD_BATCH_MAX_FILES `files` parts and an
+    optional `doc_type` for all of them. Each file is streamed and hashed
+    like a single upload; the rows are inserted with one statement and
+    committed together, so either every file is stored or none is.
+    """
+    uploads = await receive_uploads(request, blobs.UPLOAD_TEMP_DIR)
+    file_paths = await blobs.store_many(db, uploads)
+
+    doc_type = uploads[0].fields.get("doc_type", "other")
+    docs = (await db.scalars(
+        insert(Document).returning(Document, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": current_user.id,
+                "doc_type": doc_type,
+                "filename": upload.filename or "unknown",
+                "file_path": file_path,
+                "file_size": upload.size,
+                "mime_type": upload.content_type,
+                "sha256": upload.sha256,
+            }
+            for upload, file_path in zip(uploads, file_paths)
+        ],
+    )).all()
+    await stats.bump(db, {"documents": len(docs)})
+    if doc_type in PARSEABLE_DOC_TYPES:
+        for doc in docs:
+            background_tasks.add_task(parsing.enqueue, doc.id)  # run after the commit
+    return [DocumentResponse.model_validate(doc) for doc in docs]
+
+
+@router.get("/", response_model=list[DocumentSummary])
+async def list_documents(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List the current user's documents, newest first (summaries; see X-Next-Cursor for more)."""
+    stmt = select(*(getattr(Document, field) for field in DocumentSummary.model_fields))
+    stmt = paginate(stmt.where(Document.user_id == current_user.id), Document.uploaded_at, Document.id, page)
+    rows = page_rows((await db.execute(stmt)).all(), page, response, "uploaded_at")
+    return [DocumentSummary.model_validate(row) for row in rows]
+
+
+@router.get("/{doc_id}", response_model=DocumentResponse)
+async def get_document(
+    doc_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a document's metadata, including parsed data."""
+    result = await db.execute(
+        select(Document).where(Document.id == doc_id, Document.user_id == current_user.id)
+    )
+    doc = result.scalar_one_or_none()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return DocumentResponse.model_validate(doc)
+
+
+@router.get(
+    "/{doc_id}/content",
+    response_class=Response,
+    responses={
+        200: {"content": {"application/octet-stream": {}}, "description": "The file"},
+        206: {"description": "The requested byte range"},
+        304: {"description": "Not modified since the ETag / Last-Modified the client has"},
+        416: {"description": "Range not satisfiable"},
+    },
+)
+async def download_document(
+    doc_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Download the stored file, for previews.
+
+    Supports `Range` (one byte range, with `If-Range`) and conditional
+    requests: the ETag is the content's SHA-256, so a matching
+    `If-None-Match` gets 304 without touching the disk.
+    """
     result = await db.execute(
-        select(Document)
-        .where(Document.user_id == current_user.id)
-        .order_by(Document.uploaded_at.desc())
+        select(Document.file_path, Document.filename, Document.mime_type, Document.sha256, Document.uploaded_at)
+        .where(Document.id == doc_id, Document.user_id == current_user.id)
+    )
+    doc = result.one_or_none()
+    if not doc:
+        raise HTTPException(status_code=404, detail="Document not found")
+    return await file_response(
+        request,
+        doc.file_path,
+        etag=f'"{doc.sha256}"' if doc.sha256 else None,
+        last_modified=doc.uploaded_at,
+        media_type=doc.mime_type,
+        filename=doc.filename,
     )
-    return [DocumentResponse.model_validate(d) for d in result.scalars().all()]
 
 
 @router.delete("/{doc_id}", status_code=204)
@@ -83,8 +178,9 @@ async def delete_document(
     if not doc:
         raise HTTPException(status_code=404, detail="Document not found")
 
-    # Remove file from disk
-    if os.path.exists(doc.file_path):
-        os.remove(doc.file_path)
-
     await db.delete(doc)
+    await stats.bump(db, {"documents": -1})
+    orphan = await blobs.release(db, doc.sha256, doc.file_path)
+    await db.commit()  # the file goes only once the rows are gone for good
+    if orphan is not None:
+        await blobs.purge(doc.sha256, orphan)
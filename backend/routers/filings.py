@@ -1,21 +1,95 @@
 """Filing API routes — CRUD + tax calculation."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.database import get_db
+from backend.config import settings
+from backend.database import get_db, get_read_db
 from backend.models.user import User
 from backend.models.filing import Filing
+from backend.models.document import Document
 from backend.schemas.filing import (
-    FilingCreate, FilingUpdate, FilingResponse,
+    FilingCreate, FilingUpdate, FilingPrefillRequest, FilingResponse, FilingSummary,
     TaxComparisonResponse, IncomeData, DeductionData,
+    BatchTaxRequest, BatchTaxResponse,
 )
-from backend.services.tax_engine import compare_regimes, generate_optimization_suggestions
+from backend.services import stats
+from backend.services.document_parser import PARSEABLE_DOC_TYPES
+from backend.services.executor import compare_regimes_batch_json
+from backend.services.optimizer import generate_optimization_suggestions, optimize_deductions
+from backend.services.tax_engine import compare_regimes_cached, computation_fingerprint
+from backend.services.tax_rules import SUPPORTED_FINANCIAL_YEARS
+from backend.utils.merge_patch import MERGE_PATCH_MEDIA_TYPE, apply_merge_patch
+from backend.utils.pagination import PageParams, page_rows, paginate
 from backend.utils.security import get_current_user
 
 router = APIRouter(prefix="/api/filings", tags=["Filings"])
 
+# Statuses at or past calculation — a fingerprint match there needs no write at all.
+_CALCULATED_STATUSES = ("calculated", "submitted", "filed")
+
+_RESPONSE_COLUMNS = tuple(getattr(Filing, field) for field in FilingResponse.model_fields)
+
+# Fields a merge patch may touch; the JSON blobs merge member by member
+_PATCHABLE_FIELDS = frozenset(FilingUpdate.model_fields)
+_JSON_FIELDS = frozenset({"personal_info", "income_data", "deduction_data"})
+
+# A patch without If-Match is re-applied on top of concurrent saves this many times
+_PATCH_ATTEMPTS = 3
+
+
+def _check_financial_year(financial_year: str):
+    """Reject stored filings whose year the tax engine has no rules for."""
+    if financial_year not in SUPPORTED_FINANCIAL_YEARS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported financial year {financial_year} "
+                   f"(supported: {', '.join(SUPPORTED_FINANCIAL_YEARS)})",
+        )
+
+
+def _etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def _parse_if_match(if_match: str | None) -> int | None:
+    """Filing version an If-Match header requires (None for no header or "*")."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        # Not an ETag we issued, so it cannot match the current one
+        raise HTTPException(status_code=412, detail="Filing has been modified")
+
+
+async def _update_owned_filing(
+    db: AsyncSession, filing_id: str, user_id: str, values: dict, expected_version: int | None = None,
+) -> Row | None:
+    """Ownership-checked UPDATE returning the response columns.
+
+    Bumps the filing's version; with `expected_version` the UPDATE only
+    applies if the version still matches. Returns None if no row matched.
+    One round trip via UPDATE ... RETURNING; dialects without it (SQLite < 3.35)
+    fall back to UPDATE then SELECT.
+    """
+    stmt = (
+        update(Filing)
+        .where(Filing.id == filing_id, Filing.user_id == user_id)
+        .values(**values, version=Filing.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(Filing.version == expected_version)
+    if db.get_bind().dialect.update_returning:
+        return (await db.execute(stmt.returning(*_RESPONSE_COLUMNS))).one_or_none()
+    if (await db.execute(stmt)).rowcount == 0:
+        return None
+    return (await db.execute(select(*_RESPONSE_COLUMNS).where(Filing.id == filing_id))).one()
+
 
 @router.post("/", response_model=FilingResponse, status_code=status.HTTP_201_CREATED)
 async def create_filing(
@@ -34,36 +108,58 @@ async def create_filing(
     db.add(filing)
     await db.flush()
     await db.refresh(filing)
+    await stats.bump(db, stats.filing_counters(filing.status, filing.regime, filing.itr_type))
     return FilingResponse.model_validate(filing)
 
 
-@router.get("/", response_model=list[FilingResponse])
-async def list_filings(
+@router.post("/batch-calculate", response_model=BatchTaxResponse)
+async def batch_calculate(
+    data: BatchTaxRequest,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
 ):
-    """List all filings for the current user."""
-    result = await db.execute(
-        select(Filing)
-        .where(Filing.user_id == current_user.id)
-        .order_by(Filing.created_at.desc())
+    """Compute both regimes for many filings at once from columnar income/deduction data."""
+    count = max(len(c) for c in [*data.income.values(), *data.deductions.values(), data.tds_paid or []])
+    if count > settings.BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {settings.BATCH_MAX_ROWS} filings)")
+
+    # Large books are computed and JSON-encoded in the engine process pool; the
+    # encoded columns skip response_model re-validation and the stdlib encoder.
+    content = await compare_regimes_batch_json(
+        data.income, data.deductions, data.tds_paid if data.tds_paid is not None else 0,
+        data.financial_year, count,
     )
-    return [FilingResponse.model_validate(f) for f in result.scalars().all()]
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/", response_model=list[FilingSummary])
+async def list_filings(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List the current user's filings, newest first (summaries; see X-Next-Cursor for more)."""
+    stmt = select(*(getattr(Filing, field) for field in FilingSummary.model_fields))
+    stmt = paginate(stmt.where(Filing.user_id == current_user.id), Filing.created_at, Filing.id, page)
+    rows = page_rows((await db.execute(stmt)).all(), page, response, "created_at")
+    return [FilingSummary.model_validate(row) for row in rows]
 
 
 @router.get("/{filing_id}", response_model=FilingResponse)
 async def get_filing(
     filing_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    """Get a specific filing by ID."""
+    """Get a specific filing by ID (its ETag is the If-Match value for PATCH)."""
     result = await db.execute(
         select(Filing).where(Filing.id == filing_id, Filing.user_id == current_user.id)
     )
     filing = result.scalar_one_or_none()
     if not filing:
         raise HTTPException(status_code=404, detail="Filing not found")
+    response.headers["ETag"] = _etag(filing.version)
     return FilingResponse.model_validate(filing)
 
 
@@ -71,74 +167,234 @@ async def get_filing(
 async def update_filing(
     filing_id: str,
     data: FilingUpdate,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Update filing data (used by the wizard to save each step)."""
-    result = await db.execute(
-        select(Filing).where(Filing.id == filing_id, Filing.user_id == current_user.id)
-    )
-    filing = result.scalar_one_or_none()
-    if not filing:
+    """Replace filing fields; whole JSON blobs are overwritten (see PATCH for partial saves).
+
+    A save is a single UPDATE ... RETURNING; status/regime changes also
+    lock and read the old values first to move the admin stat counters.
+    """
+    # Blobs sent are stored whole, defaults filled — the same shape PATCH stores
+    values = {field: value for field, value in data.model_dump(include=data.model_fields_set).items() if value is not None}
+    if not values:
+        return await get_filing(filing_id, response, current_user, db)
+
+    counted = None
+    if "status" in values or "regime" in values:
+        counted = (await db.execute(
+            select(Filing.status, Filing.regime, Filing.itr_type)
+            .where(Filing.id == filing_id, Filing.user_id == current_user.id)
+            .with_for_update()
+        )).one_or_none()
+
+    row = await _update_owned_filing(db, filing_id, current_user.id, values)
+    if row is None:
         raise HTTPException(status_code=404, detail="Filing not found")
+    if counted is not None:
+        await stats.bump(db, stats.transition(
+            stats.filing_counters(*counted), stats.filing_counters(row.status, row.regime, row.itr_type),
+        ))
+    response.headers["ETag"] = _etag(row.version)
+    return FilingResponse.model_validate(row)
 
-    update_fields = data.model_dump(exclude_unset=True)
-    for field, value in update_fields.items():
-        if value is not None:
-            if hasattr(value, "model_dump"):
-                setattr(filing, field, value.model_dump())
-            else:
-                setattr(filing, field, value)
 
-    if data.status:
-        filing.status = data.status
+def _merge_values(current: Row, patch: dict) -> dict:
+    """Apply `patch` to the stored fields and validate the result into UPDATE values."""
+    merged = apply_merge_patch({field: getattr(current, field) for field in patch.keys() & _JSON_FIELDS}, patch)
+    cleared = [field for field in patch if field not in merged and field not in _JSON_FIELDS]
+    if cleared:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body", field), "msg": "Field cannot be null", "input": None}
+             for field in cleared]
+        )
+    try:
+        data = FilingUpdate.model_validate(merged)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+    # Blobs are stored normalised (defaults filled, unknown members dropped), as PUT stores them
+    return data.model_dump(include=set(patch))
 
-    db.add(filing)
-    await db.flush()
-    await db.refresh(filing)
-    return FilingResponse.model_validate(filing)
+
+async def _patch_owned_filing(
+    db: AsyncSession, filing_id: str, user_id: str, patch: dict, expected: int | None,
+) -> Row:
+    """Merge `patch` into the filing with version-checked UPDATEs (412 / 409 on conflicts)."""
+    for _ in range(_PATCH_ATTEMPTS):
+        current = (await db.execute(
+            select(Filing.version, Filing.status, Filing.regime, Filing.itr_type,
+                   *(getattr(Filing, field) for field in patch.keys() & _JSON_FIELDS))
+            .where(Filing.id == filing_id, Filing.user_id == user_id)
+        )).one_or_none()
+        if current is None:
+            raise HTTPException(status_code=404, detail="Filing not found")
+        if expected is not None and current.version != expected:
+            raise HTTPException(status_code=412, detail="Filing has been modified")
+
+        values = _merge_values(current, patch)
+        row = await _update_owned_filing(db, filing_id, user_id, values, current.version)
+        if row is not None:
+            break
+        if expected is not None:
+            raise HTTPException(status_code=412, detail="Filing has been modified")
+    else:
+        raise HTTPException(status_code=409, detail="Filing is being modified concurrently, please retry")
+
+    if "status" in values or "regime" in values:
+        await stats.bump(db, stats.transition(
+            stats.filing_counters(current.status, current.regime, current.itr_type),
+            stats.filing_counters(row.status, row.regime, row.itr_type),
+        ))
+    return row
+
+
+@router.patch("/{filing_id}", response_model=FilingResponse)
+async def patch_filing(
+    filing_id: str,
+    response: Response,
+    patch: dict = Body(..., media_type=MERGE_PATCH_MEDIA_TYPE),
+    if_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Apply a JSON merge patch (RFC 7386) — the wizard sends only the fields that changed.
+
+    `personal_info`, `income_data` and `deduction_data` merge member by member
+    (null clears a member, or the whole blob). With `If-Match: <ETag>` the save
+    fails with 412 if another tab saved first; without it the patch is applied
+    on top of whatever is stored. Each attempt is one read plus one
+    version-checked UPDATE ... RETURNING.
+    """
+    unknown = set(patch) - _PATCHABLE_FIELDS
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    expected = _parse_if_match(if_match)
+    if not patch:
+        return await get_filing(filing_id, response, current_user, db)
+
+    row = await _patch_owned_filing(db, filing_id, current_user.id, patch, expected)
+    response.headers["ETag"] = _etag(row.version)
+    return FilingResponse.model_validate(row)
+
+
+@router.post("/{filing_id}/prefill", response_model=FilingResponse)
+async def prefill_filing(
+    filing_id: str,
+    data: FilingPrefillRequest,
+    response: Response,
+    if_match: str | None = Header(default=None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Copy the figures parsed from a Form 16 or salary slip into the filing.
+
+    Parsed income and deduction members overwrite the filing's (others are
+    kept), as does TDS paid; the PAN / employer TAN found are copied into
+    personal_info. 409 while the document is still being parsed. Honours
+    `If-Match` like PATCH.
+    """
+    expected = _parse_if_match(if_match)
+    doc = (await db.execute(
+        select(Document.doc_type, Document.parsed_data)
+        .where(Document.id == data.document_id, Document.user_id == current_user.id)
+    )).one_or_none()
+    if doc is None:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if doc.doc_type not in PARSEABLE_DOC_TYPES:
+        raise HTTPException(status_code=422, detail="Only Form 16 and salary slip documents can prefill a filing")
+    if doc.parsed_data is None:
+        raise HTTPException(status_code=409, detail="Document has not been parsed yet, please retry shortly")
+    if doc.parsed_data.get("status") != "parsed":
+        raise HTTPException(status_code=422, detail=f"Document could not be parsed: {doc.parsed_data.get('error')}")
+
+    parsed = doc.parsed_data
+    patch = {field: parsed[field] for field in ("income_data", "deduction_data", "personal_info") if parsed.get(field)}
+    if parsed.get("tds_paid") is not None:
+        patch["tds_paid"] = parsed["tds_paid"]
+    row = await _patch_owned_filing(db, filing_id, current_user.id, patch, expected)
+    response.headers["ETag"] = _etag(row.version)
+    return FilingResponse.model_validate(row)
 
 
 @router.post("/{filing_id}/calculate", response_model=TaxComparisonResponse)
 async def calculate_tax(
     filing_id: str,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Run the tax engine on a filing — returns old vs new regime comparison."""
+    """Run the tax engine on a filing — returns old vs new regime comparison.
+
+    The row is locked while it is read, so the status the admin stat
+    counters move away from is still the stored one when the UPDATE lands.
+    Saving a new result bumps the filing's version; the ETag is the current one.
+    """
     result = await db.execute(
-        select(Filing).where(Filing.id == filing_id, Filing.user_id == current_user.id)
+        select(
+            Filing.income_data, Filing.deduction_data, Filing.tds_paid, Filing.regime,
+            Filing.financial_year, Filing.status, Filing.tax_computation, Filing.computation_fingerprint,
+            Filing.version,
+        )
+        .where(Filing.id == filing_id, Filing.user_id == current_user.id)
+        .with_for_update()
     )
-    filing = result.scalar_one_or_none()
+    filing = result.one_or_none()
     if not filing:
         raise HTTPException(status_code=404, detail="Filing not found")
 
     income_data = filing.income_data or {}
     deduction_data = filing.deduction_data or {}
     tds_paid = filing.tds_paid or 0
+    _check_financial_year(filing.financial_year)
 
-    comparison = compare_regimes(income_data, deduction_data, tds_paid)
+    # Unchanged inputs — serve the stored result without touching the engine or the DB
+    fingerprint = computation_fingerprint(
+        income_data, deduction_data, tds_paid, filing.regime, filing.financial_year
+    )
+    if (
+        filing.computation_fingerprint == fingerprint
+        and filing.tax_computation
+        and filing.status in _CALCULATED_STATUSES
+    ):
+        response.headers["ETag"] = _etag(filing.version)
+        return filing.tax_computation
 
-    # Save computation result
-    filing.tax_computation = comparison
-    chosen = comparison[f"{filing.regime}_regime"]
-    filing.total_income = chosen["gross_total_income"]
-    filing.tax_payable = chosen["total_tax"]
-    filing.refund = max(0, chosen["refund_or_due"])
-    filing.status = "calculated"
+    comparison = compare_regimes_cached(
+        fingerprint, income_data, deduction_data, tds_paid, filing.financial_year
+    )
 
-    db.add(filing)
-    await db.flush()
-    await db.refresh(filing)
+    # Save computation result — one UPDATE, nothing to read back
+    tax_computation = comparison.to_dict()
+    chosen = comparison.old_regime if filing.regime == "old" else comparison.new_regime
+    await db.execute(
+        update(Filing)
+        .where(Filing.id == filing_id, Filing.user_id == current_user.id)
+        .values(
+            tax_computation=tax_computation,
+            computation_fingerprint=fingerprint,
+            total_income=chosen.gross_total_income,
+            tax_payable=chosen.total_tax,
+            refund=max(0, chosen.refund_or_due),
+            status="calculated",
+            version=Filing.version + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    response.headers["ETag"] = _etag(filing.version + 1)
+    if filing.status != "calculated":
+        await stats.bump(db, {f"filings.status.{filing.status}": -1, "filings.status.calculated": 1})
 
-    return TaxComparisonResponse(**comparison)
+    return tax_computation
 
 
 @router.get("/{filing_id}/suggestions")
 async def get_suggestions(
     filing_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Get tax optimization suggestions for a filing."""
     result = await db.execute(
@@ -150,5 +406,32 @@ async def get_suggestions(
 
     income_data = filing.income_data or {}
     deduction_data = filing.deduction_data or {}
+    _check_financial_year(filing.financial_year)
 
-    return generate_optimization_suggestions(income_data, deduction_data)
+    return generate_optimization_suggestions(
+        IncomeData.model_validate(income_data), DeductionData.model_validate(deduction_data),
+        filing.financial_year,
+    )
+
+
+@router.get("/{filing_id}/optimize")
+async def optimize_filing(
+    filing_id: str,
+    budget: float | None = Query(default=None, ge=0, description="Amount available to invest"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Best split of `budget` across 80C / 80CCD(1B) / 80D and the regime to file under."""
+    result = await db.execute(
+        select(Filing).where(Filing.id == filing_id, Filing.user_id == current_user.id)
+    )
+    filing = result.scalar_one_or_none()
+    if not filing:
+        raise HTTPException(status_code=404, detail="Filing not found")
+    _check_financial_year(filing.financial_year)
+
+    return optimize_deductions(
+        IncomeData.model_validate(filing.income_data or {}),
+        DeductionData.model_validate(filing.deduction_data or {}),
+        budget, filing.financial_year,
+    )
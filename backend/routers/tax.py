@@ -0,0 +1,43 @@
+"""Stateless tax API routes — compute from request payloads, never touch the database."""
+
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException
+
+from backend.config import settings
+from backend.schemas.filing import (
+    TaxPreviewRequest, TaxComparisonResponse, TaxSweepRequest, TaxSweepResponse,
+)
+from backend.services.sweep import sweep_tax
+from backend.services.tax_engine import compare_regimes
+from backend.utils.security import get_current_user_id
+
+router = APIRouter(prefix="/api/tax", tags=["Tax"])
+
+
+@router.post("/preview", response_model=TaxComparisonResponse)
+async def preview_tax(
+    data: TaxPreviewRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Old vs new regime comparison for unsaved wizard data (JWT-only auth, no DB)."""
+    return compare_regimes(
+        data.income_data, data.deduction_data, data.tds_paid, data.financial_year
+    ).to_dict()
+
+
+@router.post("/sweep", response_model=TaxSweepResponse)
+async def sweep(
+    data: TaxSweepRequest,
+    user_id: str = Depends(get_current_user_id),
+):
+    """Both regimes' tax over a grid of one or two varying fields, with break-even points."""
+    total_points = int(np.prod([axis.points for axis in data.axes]))
+    if total_points > settings.SWEEP_MAX_POINTS:
+        raise HTTPException(status_code=413, detail=f"Grid too large (max {settings.SWEEP_MAX_POINTS} points)")
+
+    return sweep_tax(
+        data.income_data,
+        data.deduction_data,
+        [(axis.field, np.linspace(axis.start, axis.stop, axis.points)) for axis in data.axes],
+        data.financial_year,
+    )
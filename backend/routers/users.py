@@ -6,7 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.database import get_db
 from backend.models.user import User
 from backend.schemas.user import UserUpdate, UserResponse
-from backend.utils.security import get_current_user
+from backend.utils.security import get_current_user, invalidate_user
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
@@ -31,4 +31,6 @@ async def update_profile(
     db.add(current_user)
     await db.flush()
     await db.refresh(current_user)
+    await db.commit()  # before dropping the cached row, so no request re-caches the old one
+    invalidate_user(current_user.id)
     return UserResponse.model_validate(current_user)
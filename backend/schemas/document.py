@@ -4,6 +4,20 @@ from datetime import datetime
 from pydantic import BaseModel
 
 
+class DocumentSummary(BaseModel):
+    """Listing row — a document without its parsed data."""
+    id: str
+    user_id: str
+    doc_type: str
+    filename: str
+    file_size: int | None
+    mime_type: str | None
+    uploaded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class DocumentResponse(BaseModel):
     id: str
     user_id: str
@@ -11,6 +25,7 @@ class DocumentResponse(BaseModel):
     filename: str
     file_size: int | None
     mime_type: str | None
+    sha256: str | None
     parsed_data: dict | None
     uploaded_at: datetime
 
@@ -1,7 +1,20 @@
 """Pydantic schemas for Filing-related requests and responses."""
 
 from datetime import datetime
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field, model_validator
+
+from backend.services.tax_rules import SUPPORTED_FINANCIAL_YEARS
+
+
+def _supported_year(value: str) -> str:
+    if value not in SUPPORTED_FINANCIAL_YEARS:
+        raise ValueError(f"Unsupported financial year (supported: {', '.join(SUPPORTED_FINANCIAL_YEARS)})")
+    return value
+
+
+FinancialYear = Annotated[str, AfterValidator(_supported_year)]
 
 
 class IncomeData(BaseModel):
@@ -36,7 +49,7 @@ class PersonalInfo(BaseModel):
 
 
 class FilingCreate(BaseModel):
-    financial_year: str = "2025-2026"
+    financial_year: FinancialYear = "2025-2026"
     assessment_year: str = "2026-2027"
     itr_type: str = "ITR-1"
     regime: str = "new"
@@ -51,6 +64,53 @@ class FilingUpdate(BaseModel):
     status: str | None = None
 
 
+class FilingPrefillRequest(BaseModel):
+    document_id: str  # a parsed Form 16 or salary slip
+
+
+class TaxPreviewRequest(BaseModel):
+    income_data: IncomeData = IncomeData()
+    deduction_data: DeductionData = DeductionData()
+    tds_paid: float = 0
+    financial_year: FinancialYear = "2025-2026"
+
+
+class SweepAxis(BaseModel):
+    field: str  # any IncomeData / DeductionData field
+    start: float = 0
+    stop: float
+    points: int = Field(default=50, ge=2, le=1000)
+
+
+class TaxSweepRequest(BaseModel):
+    income_data: IncomeData = IncomeData()
+    deduction_data: DeductionData = DeductionData()
+    financial_year: FinancialYear = "2025-2026"
+    axes: list[SweepAxis] = Field(min_length=1, max_length=2)
+
+    @model_validator(mode="after")
+    def check_axes(self):
+        fields = [axis.field for axis in self.axes]
+        unknown = set(fields) - set(IncomeData.model_fields) - set(DeductionData.model_fields)
+        if unknown:
+            raise ValueError(f"Unknown sweep fields: {', '.join(sorted(unknown))}")
+        if len(set(fields)) != len(fields):
+            raise ValueError("Sweep axes must vary different fields")
+        return self
+
+
+class SweepAxisValues(BaseModel):
+    field: str
+    values: list[float]
+
+
+class TaxSweepResponse(BaseModel):
+    axes: list[SweepAxisValues]
+    old_regime: list[float] | list[list[float]]  # total tax, shaped like the grid
+    new_regime: list[float] | list[list[float]]
+    break_even: list[float] | list[list[float]]  # along axis 0 (per axis-1 value for 2-D grids)
+
+
 class TaxComputationResult(BaseModel):
     regime: str
     gross_total_income: float
@@ -71,6 +131,71 @@ class TaxComparisonResponse(BaseModel):
     savings: float
 
 
+class BatchTaxRequest(BaseModel):
+    """Columnar input — one list per IncomeData / DeductionData field, one entry per filing."""
+    income: dict[str, list[float]]
+    deductions: dict[str, list[float]] = {}
+    tds_paid: list[float] | None = None
+    financial_year: FinancialYear = "2025-2026"
+
+    @model_validator(mode="after")
+    def check_columns(self):
+        unknown = (set(self.income) - set(IncomeData.model_fields)) | (
+            set(self.deductions) - set(DeductionData.model_fields)
+        )
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        columns = [*self.income.values(), *self.deductions.values()]
+        if self.tds_paid is not None:
+            columns.append(self.tds_paid)
+        if not columns:
+            raise ValueError("At least one column is required")
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError("All columns must have the same length")
+        return self
+
+
+class BatchTaxColumns(BaseModel):
+    regime: str
+    gross_total_income: list[float]
+    total_deductions: list[float]
+    taxable_income: list[float]
+    tax_on_income: list[float]
+    surcharge: list[float]
+    cess: list[float]
+    total_tax: list[float]
+    tds_paid: list[float]
+    refund_or_due: list[float]
+
+
+class BatchTaxResponse(BaseModel):
+    count: int
+    old_regime: BatchTaxColumns
+    new_regime: BatchTaxColumns
+    recommended: list[str]
+    savings: list[float]
+
+
+class FilingSummary(BaseModel):
+    """Listing row — a filing without its JSON wizard/computation blobs."""
+    id: str
+    user_id: str
+    financial_year: str
+    assessment_year: str
+    itr_type: str
+    status: str
+    regime: str
+    total_income: float
+    tax_payable: float
+    tds_paid: float
+    refund: float
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class FilingResponse(BaseModel):
     id: str
     user_id: str
@@ -87,6 +212,7 @@ class FilingResponse(BaseModel):
     tax_payable: float
     tds_paid: float
     refund: float
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -0,0 +1,211 @@
+"""Vectorized tax engine — computes whole taxpayer populations in one pass.
+
+Mirrors `tax_engine.compute_old_regime` / `compute_new_regime` /
+`compare_regimes`, but every income and deduction field is a NumPy column
+(one entry per filing) instead of a per-taxpayer dict.
+"""
+
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from typing import Mapping
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from backend.services.tax_rules import DEFAULT_FINANCIAL_YEAR, TaxRules, get_rules
+from backend.services.tax_tables import SlabTable, SurchargeTable
+
+INCOME_FIELDS = (
+    "salary",
+    "house_property",
+    "capital_gains_short",
+    "capital_gains_long",
+    "business_income",
+    "other_income",
+)
+
+DEDUCTION_DEFAULTS = {
+    "section_80c": 0.0,
+    "section_80ccd_1b": 0.0,
+    "section_80d": 0.0,
+    "section_80g": 0.0,
+    "hra_exemption": 0.0,
+    "home_loan_interest": 0.0,
+    "education_loan_interest": 0.0,
+    "standard_deduction": 75000.0,
+}
+
+
+def _column(data: Mapping[str, ArrayLike], field: str, size: int, default: float = 0.0) -> np.ndarray:
+    """Fetch a column as a float64 array, broadcasting scalars and filling missing fields."""
+    if field not in data:
+        return np.full(size, default, dtype=np.float64)
+    return np.broadcast_to(np.asarray(data[field], dtype=np.float64), (size,))
+
+
+def _population_size(*sources: Mapping[str, ArrayLike] | ArrayLike) -> int:
+    """Length of the longest non-scalar column across all inputs."""
+    lengths = []
+    for source in sources:
+        columns = source.values() if isinstance(source, Mapping) else [source]
+        lengths.extend(np.shape(column)[0] for column in columns if np.ndim(column))
+    return max(lengths) if lengths else 1
+
+
+@dataclass(slots=True)
+class BatchRegimeResult:
+    """One regime's computation for every filing; each field is indexed by filing."""
+
+    regime: str
+    gross_total_income: np.ndarray
+    total_deductions: np.ndarray
+    taxable_income: np.ndarray
+    tax_on_income: np.ndarray
+    surcharge: np.ndarray
+    cess: np.ndarray
+    total_tax: np.ndarray
+    tds_paid: np.ndarray
+    refund_or_due: np.ndarray
+
+    def to_columns(self) -> dict:
+        """JSON shape of `BatchTaxColumns` (plain lists)."""
+        return {
+            f.name: self.regime if f.name == "regime" else getattr(self, f.name).tolist()
+            for f in fields(self)
+        }
+
+
+@dataclass(slots=True)
+class BatchComparison:
+    """Both regimes and the per-filing recommendation for a population."""
+
+    old_regime: BatchRegimeResult
+    new_regime: BatchRegimeResult
+    recommended: np.ndarray
+    savings: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.savings)
+
+    def to_columns(self) -> dict:
+        """JSON shape of `BatchTaxResponse`."""
+        return {
+            "count": len(self),
+            "old_regime": self.old_regime.to_columns(),
+            "new_regime": self.new_regime.to_columns(),
+            "recommended": self.recommended.tolist(),
+            "savings": self.savings.tolist(),
+        }
+
+
+@lru_cache(maxsize=None)
+def _slab_arrays(table: SlabTable) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return np.array(table.breakpoints, dtype=np.float64), np.array(table.rates), np.array(table.cumulative)
+
+
+@lru_cache(maxsize=None)
+def _surcharge_arrays(table: SurchargeTable) -> tuple[np.ndarray, np.ndarray]:
+    return np.array(table.limits, dtype=np.float64), np.array(table.rates)
+
+
+def _slab_tax(taxable_income: np.ndarray, table: SlabTable) -> np.ndarray:
+    """Slab tax plus 87A rebate for every taxpayer — one searchsorted, one multiply."""
+    breakpoints, rates, cumulative = _slab_arrays(table)
+    i = np.searchsorted(breakpoints, taxable_income, side="right") - 1
+    tax = cumulative[i] + (taxable_income - breakpoints[i]) * rates[i]
+    return np.where(taxable_income <= table.rebate_limit, np.maximum(0, tax - table.rebate), tax)
+
+
+def _surcharge(tax: np.ndarray, taxable_income: np.ndarray, table: SurchargeTable) -> np.ndarray:
+    """Surcharge on income tax, picking each taxpayer's band by taxable income."""
+    limits, rates = _surcharge_arrays(table)
+    return tax * rates[np.searchsorted(limits, taxable_income, side="left")]
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """`round(value, 2)` for every value, matching the scalar engine to the paisa.
+
+    `np.round` scales by 100 and rounds half to even, which differs from the
+    correctly rounded builtin when the scaled value lands on (or within an ulp
+    of) a half; those few values are rounded with the builtin.
+    """
+    scaled = values * 100
+    out = np.round(scaled) / 100
+    tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    if tie.any():
+        out[tie] = [round(value, 2) for value in values[tie].tolist()]
+    return out
+
+
+def _finish(
+    rules: TaxRules,
+    regime: str,
+    gross_total_income: np.ndarray,
+    total_deductions: np.ndarray,
+    taxable_income: np.ndarray,
+    tax: np.ndarray,
+    tds_paid: np.ndarray,
+) -> BatchRegimeResult:
+    surcharge = _surcharge(tax, taxable_income, rules.surcharge)
+    cess = (tax + surcharge) * rules.cess_rate
+    total_tax = _round2(tax + surcharge + cess)
+    return BatchRegimeResult(
+        regime=regime,
+        gross_total_income=gross_total_income,
+        total_deductions=total_deductions,
+        taxable_income=taxable_income,
+        tax_on_income=_round2(tax),
+        surcharge=_round2(surcharge),
+        cess=_round2(cess),
+        total_tax=total_tax,
+        tds_paid=tds_paid,
+        refund_or_due=_round2(tds_paid - total_tax),
+    )
+
+
+def compare_regimes_batch(
+    income: Mapping[str, ArrayLike],
+    deductions: Mapping[str, ArrayLike],
+    tds_paid: ArrayLike = 0,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+) -> BatchComparison:
+    """Compute both regimes for a population of filings and recommend per filing.
+
+    `income` and `deductions` map `IncomeData` / `DeductionData` field names to
+    equal-length columns (scalars broadcast). The result mirrors
+    `compare_regimes`, with every field an array indexed by filing.
+    """
+    rules = get_rules(financial_year)
+    size = _population_size(income, deductions, tds_paid)
+    tds = _column({"tds_paid": tds_paid}, "tds_paid", size)
+
+    gross_total_income = sum(_column(income, field, size) for field in INCOME_FIELDS)
+    ded = {field: _column(deductions, field, size, default) for field, default in DEDUCTION_DEFAULTS.items()}
+
+    # Old regime — all Chapter VI-A deductions, HRA and Section 24
+    old_deductions = (
+        np.minimum(ded["standard_deduction"], rules.standard_deduction_old)
+        + np.minimum(ded["section_80c"], rules.cap_80c)
+        + np.minimum(ded["section_80ccd_1b"], rules.cap_80ccd_1b)
+        + ded["section_80d"]
+        + ded["section_80g"]
+        + ded["hra_exemption"]
+        + np.minimum(ded["home_loan_interest"], rules.cap_home_loan_interest)
+        + ded["education_loan_interest"]
+    )
+    old_taxable = np.maximum(0, gross_total_income - old_deductions)
+    old_tax = _slab_tax(old_taxable, rules.old_slabs)
+    old = _finish(rules, "old", gross_total_income, old_deductions, old_taxable, old_tax, tds)
+
+    # New regime — standard deduction only
+    new_deductions = np.minimum(ded["standard_deduction"], rules.standard_deduction_new)
+    new_taxable = np.maximum(0, gross_total_income - new_deductions)
+    new_tax = _slab_tax(new_taxable, rules.new_slabs)
+    new = _finish(rules, "new", gross_total_income, new_deductions, new_taxable, new_tax, tds)
+
+    return BatchComparison(
+        old_regime=old,
+        new_regime=new,
+        recommended=np.where(old.total_tax <= new.total_tax, "old", "new"),
+        savings=_round2(np.abs(new.total_tax - old.total_tax)),
+    )
@@ -0,0 +1,150 @@
+"""Content-addressed document storage.
+
+Uploaded files are stored once per distinct content, at
+`UPLOAD_DIR/blobs/<sha[:2]>/<sha[2:4]>/<sha>`, and a `blobs` row counts the
+Document rows pointing at it. `store` adds a reference and keeps the upload
+only if that content is not on disk yet (`store_many` does the same for a
+batch, with one upsert); `release` drops a reference and, with the last
+one, hands back the file for `purge` to delete once the transaction has
+committed. A crash or failed commit in between leaves at worst an orphaned
+file, never a document without one.
+
+Uploads place their file while the transaction holds the blob row's lock
+(after the upsert, before commit). `purge` takes the same lock by inserting
+an empty row for the content, so it either waits for a racing upload of
+the same bytes to commit and then keeps the file, or deletes the file
+before that upload can place it again.
+
+Documents uploaded before the store existed own their files directly
+(outside BLOB_DIR, no reference counted); `release` hands those files to
+`purge` as well.
+"""
+
+import asyncio
+import os
+from collections import Counter
+from contextlib import suppress
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.database import async_session
+from backend.models.blob import Blob
+from backend.utils.metrics import metrics
+from backend.utils.uploads import ReceivedUpload
+
+BLOB_DIR = os.path.join(settings.UPLOAD_DIR, "blobs")
+# Uploads stream here first — same filesystem as BLOB_DIR, so placing one is a rename
+UPLOAD_TEMP_DIR = os.path.join(settings.UPLOAD_DIR, "tmp")
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(BLOB_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def _place(temp_path: str, path: str) -> bool:
+    """Move `temp_path` to `path` unless identical content is already there; True if moved."""
+    if os.path.exists(path):
+        os.unlink(temp_path)
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(temp_path, path)
+    return True
+
+
+def _remove(path: str):
+    with suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+def _insert(db: AsyncSession):
+    return pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+async def _add_references(db: AsyncSession, uploads: list[ReceivedUpload]):
+    """One upsert adding a reference per upload (duplicates within the batch add up)."""
+    counts = Counter(upload.sha256 for upload in uploads)
+    sizes = {upload.sha256: upload.size for upload in uploads}
+    stmt = _insert(db)(Blob).values([
+        {"sha256": sha256, "size": sizes[sha256], "refcount": count} for sha256, count in counts.items()
+    ])
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[Blob.sha256], set_={"refcount": Blob.refcount + stmt.excluded.refcount}
+    ))
+
+
+async def store(db: AsyncSession, upload: ReceivedUpload) -> str:
+    """Add a reference to the upload's content (storing it if new); returns the blob path."""
+    path = blob_path(upload.sha256)
+    try:
+        await _add_references(db, [upload])
+        moved = await run_in_threadpool(_place, upload.temp_path, path)
+    except BaseException:  # including cancellation — never leave the streamed file behind
+        await upload.discard()
+        raise
+    metrics.inc("blobs.stored" if moved else "blobs.deduplicated")
+    return path
+
+
+async def store_many(db: AsyncSession, uploads: list[ReceivedUpload]) -> list[str]:
+    """`store` for a batch: one upsert, then up to `UPLOAD_BATCH_CONCURRENCY` files placed at once."""
+    paths = [blob_path(upload.sha256) for upload in uploads]
+    limit = asyncio.Semaphore(settings.UPLOAD_BATCH_CONCURRENCY)
+    first: dict[str, ReceivedUpload] = {}
+
+    async def place(upload: ReceivedUpload, path: str):
+        async with limit:
+            if first.setdefault(upload.sha256, upload) is not upload:
+                await upload.discard()  # same content earlier in the batch
+                metrics.inc("blobs.deduplicated")
+                return
+            moved = await run_in_threadpool(_place, upload.temp_path, path)
+            metrics.inc("blobs.stored" if moved else "blobs.deduplicated")
+
+    try:
+        await _add_references(db, uploads)
+        results = await asyncio.gather(*map(place, uploads, paths), return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+    except BaseException:
+        for upload in uploads:
+            await upload.discard()  # whatever was not placed
+        raise
+    return paths
+
+
+async def release(db: AsyncSession, sha256: str | None, file_path: str) -> str | None:
+    """Drop a document's reference to its content.
+
+    Returns the file to `purge` after commit when that was the last
+    reference, otherwise None.
+    """
+    if sha256 is not None and file_path == blob_path(sha256):
+        result = await db.execute(
+            update(Blob).where(Blob.sha256 == sha256).values(refcount=Blob.refcount - 1)
+        )
+        if result.rowcount:
+            result = await db.execute(delete(Blob).where(Blob.sha256 == sha256, Blob.refcount <= 0))
+            if not result.rowcount:
+                return None  # still referenced
+    return file_path
+
+
+async def purge(sha256: str | None, file_path: str):
+    """Delete a file `release` returned — call only after its transaction committed."""
+    if sha256 is None or file_path != blob_path(sha256):
+        await run_in_threadpool(_remove, file_path)
+        return
+    async with async_session() as db:
+        # Inserted only if nobody uploaded the same content since; the row
+        # lock then holds off new uploads of it until the file is gone.
+        claim = _insert(db)(Blob).values(sha256=sha256, size=0, refcount=0)
+        if (await db.execute(claim.on_conflict_do_nothing(index_elements=[Blob.sha256]))).rowcount:
+            await run_in_threadpool(_remove, file_path)
+            await db.execute(delete(Blob).where(Blob.sha256 == sha256))
+        await db.commit()
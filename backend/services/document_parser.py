@@ -0,0 +1,250 @@
+"""Document parser — text extraction and figure parsing for Form 16 and salary slips.
+
+Runs in the parsing pool's worker processes (see services.parsing), never on
+the event loop. `parse_document` extracts the text of a PDF or text file and
+pulls out the figures the filing wizard asks for, shaped like the filing's
+`income_data` / `deduction_data` / `tds_paid` so a prefill can copy them
+across.
+
+PDF text comes from pypdf when it is installed. Without it, a small
+extractor reads the page content streams directly (uncompressed or
+FlateDecode) and collects the strings drawn by the text operators — enough for
+the text-based PDFs that TRACES and payroll systems generate, but not for
+fonts with custom encodings or scanned images.
+"""
+
+import re
+import time
+import zlib
+
+PARSER_VERSION = 1
+
+PARSEABLE_DOC_TYPES = ("form16", "salary_slip")
+
+
+class DocumentParseError(Exception):
+    """The document cannot be parsed — retrying will not help."""
+
+
+# ─── Text extraction ───
+
+_STREAM = re.compile(rb"<<(?P<dict>(?:[^<>]|<<(?:[^<>]|<[^<>]*>)*>>|<[^<>]*>)*)>>\s*stream\r?\n(?P<data>.*?)endstream", re.S)
+_TEXT_TOKEN = re.compile(
+    rb"\((?P<literal>(?:\\.|[^\\()]|\((?:\\.|[^\\()])*\))*)\)"  # (string), one level of nested parens
+    rb"|<(?P<hex>[0-9A-Fa-f\s]*)>"
+    rb"|(?P<number>[-+]?(?:\d+\.?\d*|\.\d+))"
+    rb"|(?P<op>BT|ET|Tj|TJ|T\*|Td|TD|Tm|'|\"|\[|\])(?![A-Za-z*])",
+    re.S,
+)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _unescape(literal: bytes) -> bytes:
+    def replace(match: re.Match) -> bytes:
+        escaped = match.group(1)
+        if escaped[:1].isdigit():
+            return bytes([int(escaped, 8) & 0xFF])
+        if escaped in (b"\n", b"\r"):
+            return b""  # line continuation
+        return _ESCAPES.get(escaped, escaped)
+
+    return re.sub(rb"\\([0-7]{1,3}|.)", replace, literal, flags=re.S)
+
+
+def _unhex(value: bytes) -> bytes:
+    digits = re.sub(rb"\s", b"", value)
+    return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode())
+
+
+def _decode(raw: bytes) -> str:
+    if raw.startswith(b"\xfe\xff"):
+        return raw[2:].decode("utf-16-be", "replace")
+    return raw.decode("latin-1")
+
+
+def _content_text(content: bytes) -> str:
+    """The strings shown by one content stream, with line breaks where the text moves down."""
+    out: list[str] = []
+    operands: list[bytes] = []
+    array: list[bytes] | None = None
+    last_y: float | None = None
+    for match in _TEXT_TOKEN.finditer(content):
+        kind, value = match.lastgroup, match.group(match.lastgroup)
+        if kind in ("literal", "hex"):
+            raw = _unescape(value) if kind == "literal" else _unhex(value)
+            (array if array is not None else operands).append(raw)
+            continue
+        if kind == "number":
+            if array is not None:
+                # A large negative kern between strings is a word gap
+                if float(value) < -200:
+                    array.append(b" ")
+            else:
+                operands.append(value)
+            continue
+        if value == b"[":
+            array = []
+        elif value == b"]":
+            operands.append(b"".join(array or []))
+            array = None
+        elif value in (b"Tj", b"TJ") and operands:
+            out.append(_decode(operands[-1]))
+        elif value in (b"'", b'"') and operands:
+            out.extend(("\n", _decode(operands[-1])))
+        elif value == b"T*":
+            out.append("\n")
+        elif value in (b"Td", b"TD") and len(operands) >= 2:
+            out.append("\n" if float(operands[-1]) != 0 else " ")
+        elif value == b"Tm" and len(operands) >= 6:
+            y = float(operands[-1])
+            out.append("\n" if last_y is not None and abs(y - last_y) > 1 else " ")
+            last_y = y
+        elif value == b"ET":
+            out.append("\n")
+        if kind == "op" and value not in (b"[", b"]"):
+            operands = []
+    return "".join(out)
+
+
+def _stdlib_pdf_text(data: bytes) -> str:
+    pages = []
+    for match in _STREAM.finditer(data):
+        info, stream = match.group("dict"), match.group("data")
+        if b"/Image" in info or b"/FontFile" in info or b"/XRef" in info:
+            continue
+        if b"/FlateDecode" in info:
+            try:
+                stream = zlib.decompressobj().decompress(stream)
+            except zlib.error:
+                continue
+        elif b"/Filter" in info:
+            continue  # other encodings (DCT, LZW, ...) carry no text we can read
+        if b"BT" in stream:
+            pages.append(_content_text(stream))
+    return "\n".join(pages)
+
+
+def _pdf_text(path: str) -> str:
+    try:
+        import pypdf
+    except ImportError:
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(b"%PDF"):
+            raise DocumentParseError("Not a PDF file")
+        return _stdlib_pdf_text(data)
+    try:
+        return "\n".join(page.extract_text() or "" for page in pypdf.PdfReader(path).pages)
+    except pypdf.errors.PdfReadError as e:
+        raise DocumentParseError(f"Unreadable PDF: {e}") from e
+
+
+def extract_text(path: str, mime_type: str | None, filename: str) -> str:
+    name = filename.lower()
+    if mime_type == "application/pdf" or name.endswith(".pdf"):
+        return _pdf_text(path)
+    if (mime_type or "").startswith("text/") or name.endswith((".txt", ".csv")):
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", "replace")
+    raise DocumentParseError(f"Unsupported file type: {mime_type or filename}")
+
+
+# ─── Figures ───
+
+# An amount: Indian digit grouping, optional paise; not part of a section number like 80C or 17(1)
+_AMOUNT = re.compile(r"(?<![\w(.])\d[\d,]*(?:\.\d{1,2})?(?![\w(%])")
+_PAN = re.compile(r"\b[A-Z]{5}\d{4}[A-Z]\b")
+_TAN = re.compile(r"\b[A-Z]{4}\d{5}[A-Z]\b")
+
+# Field → label patterns, most specific first; the amount is the last one on the label's line
+_FORM16_INCOME = {
+    "salary": [r"gross\s+salary", r"total\s+salary", r"salary\s+as\s+per\s+provisions.*17\s*\(1\)"],
+    "house_property": [r"income\s*\(?or\s+admissible\s+loss\)?\s+from\s+house\s+property"],
+    "other_income": [r"income\s+under\s+the\s+head\s+other\s+sources", r"income\s+from\s+other\s+sources"],
+}
+_FORM16_DEDUCTIONS = {
+    "section_80ccd_1b": [r"80\s*CCD\s*\(\s*1B\s*\)"],
+    "section_80c": [r"80\s*C\b(?!\s*C)", r"section\s+80C\b"],
+    "section_80d": [r"80\s*D\b"],
+    "section_80g": [r"80\s*G\b"],
+    "education_loan_interest": [r"80\s*E\b"],
+    "hra_exemption": [r"house\s+rent\s+allowance", r"10\s*\(\s*13A\s*\)"],
+    "home_loan_interest": [r"interest\s+on\s+(?:housing|home)\s+loan", r"section\s+24\b"],
+    "standard_deduction": [r"standard\s+deduction"],
+}
+_FORM16_TDS = [r"total\s+(?:amount\s+of\s+)?tax\s+deducted", r"tax\s+deducted\s+at\s+source", r"\btds\b"]
+
+_SLIP_GROSS = [r"gross\s+(?:earnings|salary|pay)", r"total\s+earnings"]
+_SLIP_TDS = [r"income\s+tax", r"\btds\b"]
+_SLIP_PF = [r"provident\s+fund", r"\bepf\b", r"\bpf\b"]
+
+
+def _amounts(line: str) -> list[float]:
+    return [float(m.replace(",", "")) for m in _AMOUNT.findall(line)]
+
+
+def _find_amount(lines: list[str], patterns: list[str]) -> float | None:
+    """The amount after the first line matching any pattern (or on the line below, for split table cells)."""
+    for pattern in patterns:
+        regex = re.compile(pattern, re.I)
+        for i, line in enumerate(lines):
+            match = regex.search(line)
+            if match is None:
+                continue
+            amounts = _amounts(line[match.end():])
+            if not amounts and i + 1 < len(lines):
+                amounts = _amounts(lines[i + 1])
+            if amounts:
+                return amounts[-1]
+    return None
+
+
+def _figures(lines: list[str], patterns: dict[str, list[str]]) -> dict[str, float]:
+    found = {field: _find_amount(lines, field_patterns) for field, field_patterns in patterns.items()}
+    return {field: value for field, value in found.items() if value is not None}
+
+
+def _parse_form16(lines: list[str], text: str) -> dict:
+    personal_info = {}
+    if pans := _PAN.findall(text):
+        personal_info["pan"] = pans[-1]  # the employer's PAN (if any) comes first, the employee's last
+    if tans := _TAN.findall(text):
+        personal_info["employer_tan"] = tans[0]
+    return {
+        "income_data": _figures(lines, _FORM16_INCOME),
+        "deduction_data": _figures(lines, _FORM16_DEDUCTIONS),
+        "tds_paid": _find_amount(lines, _FORM16_TDS),
+        "personal_info": personal_info,
+    }
+
+
+def _parse_salary_slip(lines: list[str], text: str) -> dict:
+    """Monthly figures, annualised (×12) so they line up with a year's filing."""
+    gross, tds, pf = (_find_amount(lines, patterns) for patterns in (_SLIP_GROSS, _SLIP_TDS, _SLIP_PF))
+    return {
+        "income_data": {"salary": gross * 12} if gross is not None else {},
+        "deduction_data": {"section_80c": pf * 12} if pf is not None else {},  # employee PF counts under 80C
+        "tds_paid": tds * 12 if tds is not None else None,
+        "personal_info": {},
+        "annualised_from_month": True,
+    }
+
+
+def parse_document(path: str, mime_type: str | None, filename: str, doc_type: str) -> tuple[dict, dict[str, float]]:
+    """Parse one stored document (runs in a worker process).
+
+    Returns the `parsed_data` to store and the seconds spent per stage.
+    """
+    clock = time.perf_counter
+    start = clock()
+    text = extract_text(path, mime_type, filename)
+    extracted = clock()
+    lines = [" ".join(line.split()) for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise DocumentParseError("No text found (scanned document?)")
+
+    parsed = (_parse_form16 if doc_type == "form16" else _parse_salary_slip)(lines, text)
+    if not parsed["income_data"] and not parsed["deduction_data"] and parsed["tds_paid"] is None:
+        raise DocumentParseError("No recognisable figures found")
+    parsed.update(status="parsed", parser_version=PARSER_VERSION)
+    return parsed, {"extract": extracted - start, "parse": clock() - extracted}
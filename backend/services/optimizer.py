@@ -0,0 +1,221 @@
+"""Deduction optimizer and tax-saving suggestions.
+
+Old-regime tax is a piecewise-linear, non-decreasing function of taxable
+income, with kinks at slab breakpoints and drops at the 87A rebate and
+surcharge thresholds. Every rupee put into 80C / 80CCD(1B) / 80D lowers
+taxable income by exactly one rupee, so the only allocations worth
+evaluating are the ones that land taxable income on one of those
+breakpoints. All candidates are scored in a single vectorized pass of the
+batch engine and compared against the new regime, which deductions do not
+affect.
+"""
+
+import numpy as np
+
+from backend.schemas.filing import DeductionData, IncomeData
+from backend.services.batch_engine import BatchComparison, compare_regimes_batch
+from backend.services.tax_engine import compute_old_regime
+from backend.services.tax_rules import DEFAULT_FINANCIAL_YEAR, TaxRules, get_rules
+
+# Investment-linked sections, filled in this order (all are worth the same per rupee)
+_SECTIONS = (
+    ("section_80c", "cap_80c"),
+    ("section_80ccd_1b", "cap_80ccd_1b"),
+    ("section_80d", "cap_80d"),
+)
+
+
+def _headroom(deductions: DeductionData, rules: TaxRules) -> dict[str, float]:
+    """Unused allowance per investment section."""
+    return {
+        field: float(max(0, getattr(rules, cap) - getattr(deductions, field)))
+        for field, cap in _SECTIONS
+    }
+
+
+def _allocate(amount: float, headroom: dict[str, float]) -> dict[str, float]:
+    """Spread `amount` across sections in priority order."""
+    allocation = {}
+    for field, room in headroom.items():
+        allocation[field] = min(room, amount)
+        amount -= allocation[field]
+    return allocation
+
+
+def _breakpoint_amounts(taxable_income: float, max_amount: float, rules: TaxRules) -> list[float]:
+    """Extra deduction amounts at which the old-regime tax curve changes slope or drops."""
+    thresholds = [*rules.old_slabs.breakpoints, rules.old_slabs.rebate_limit, *rules.surcharge.limits]
+    amounts = {0.0, max_amount}
+    for threshold in thresholds:
+        amount = taxable_income - threshold
+        if 0 < amount < max_amount:
+            amounts.add(float(amount))
+    return sorted(amounts)
+
+
+def _evaluate(
+    income: IncomeData, deductions: DeductionData, extra: list[dict[str, float]], financial_year: str,
+) -> BatchComparison:
+    """Score every candidate (current deductions + `extra[i]`) in one batched engine call."""
+    base = deductions.model_dump()
+    columns = {
+        field: np.array([value + row.get(field, 0) for row in extra], dtype=np.float64)
+        for field, value in base.items()
+    }
+    return compare_regimes_batch(income.model_dump(), columns, 0, financial_year)
+
+
+def _plan_candidates(
+    income: IncomeData, deductions: DeductionData, budget: float | None, rules: TaxRules,
+) -> tuple[list[float], list[dict[str, float]], dict[str, float]]:
+    """Candidate investment amounts (tax-curve breakpoints within budget) and their allocations."""
+    headroom = _headroom(deductions, rules)
+    max_amount = sum(headroom.values())
+    if budget is not None:
+        max_amount = min(max_amount, max(0.0, budget))
+    taxable_income = compute_old_regime(income, deductions, 0, rules.financial_year).taxable_income
+    amounts = _breakpoint_amounts(taxable_income, max_amount, rules)
+    return amounts, [_allocate(a, headroom) for a in amounts], headroom
+
+
+def _pick_plan(
+    amounts: list[float], old_tax: np.ndarray, new_tax: float,
+    headroom: dict[str, float], budget: float | None, financial_year: str,
+) -> dict:
+    """Choose the cheapest candidate reaching the lowest tax; `old_tax[0]` is the no-investment case."""
+    # Lowest tax is reached at the full amount; take the smallest amount that already gets there.
+    best = int(np.flatnonzero(old_tax <= old_tax[-1])[0])
+    # Strict: never recommend investing for a tie with the new regime.
+    recommended = "old" if old_tax[best] < new_tax else "new"
+    if recommended == "new":
+        best = 0  # report the old-regime tax for the plan actually returned: no investment
+    invest = float(amounts[best])
+    return {
+        "financial_year": financial_year,
+        "budget": budget,
+        "invest": round(invest, 2),
+        "allocation": _allocate(invest, headroom),
+        "current_tax": {"old": float(old_tax[0]), "new": new_tax},
+        "optimized_tax": {"old": float(old_tax[best]), "new": new_tax},
+        "recommended_regime": recommended,
+        "savings": round(min(float(old_tax[0]), new_tax) - min(float(old_tax[best]), new_tax), 2),
+    }
+
+
+def optimize_deductions(
+    income: IncomeData, deductions: DeductionData, budget: float | None = None,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+) -> dict:
+    """Cheapest investment plan reaching the lowest achievable tax within `budget`.
+
+    `budget` defaults to the total unused allowance across 80C, 80CCD(1B) and 80D.
+    """
+    rules = get_rules(financial_year)
+    amounts, allocations, headroom = _plan_candidates(income, deductions, budget, rules)
+    result = _evaluate(income, deductions, allocations, financial_year)
+    new_tax = float(result.new_regime.total_tax[0])
+    return _pick_plan(amounts, result.old_regime.total_tax, new_tax, headroom, budget, financial_year)
+
+
+def generate_optimization_suggestions(
+    income: IncomeData, deductions: DeductionData,
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+) -> list[dict]:
+    """Tax optimization suggestions priced at the taxpayer's actual marginal savings.
+
+    Each potential saving is the drop in tax under the best regime, computed by
+    the engine with that section filled — not a flat 30% estimate.
+    """
+    rules = get_rules(financial_year)
+    home_loan = deductions.home_loan_interest
+    amounts, allocations, headroom = _plan_candidates(income, deductions, None, rules)
+
+    # Rows 0-4: as filed, each section filled on its own, a maxed-out home loan;
+    # the rest are the investment-plan candidates. One engine pass scores them all.
+    candidates = [
+        {},
+        *({field: room} for field, room in headroom.items()),
+        {"home_loan_interest": rules.cap_home_loan_interest} if home_loan == 0 else {},
+        *allocations,
+    ]
+    result = _evaluate(income, deductions, candidates, financial_year)
+    old_tax = result.old_regime.total_tax
+    new_tax = float(result.new_regime.total_tax[0])
+    best_now = min(float(old_tax[0]), new_tax)
+    saving = [round(best_now - min(float(t), new_tax), 2) for t in old_tax[:5]]
+
+    suggestions = []
+    room_80c, room_80ccd, room_80d = headroom.values()
+
+    if room_80c and saving[1] > 0:
+        suggestions.append({
+            "category": "Section 80C",
+            "title": f"Invest ₹{room_80c:,.0f} more under Section 80C",
+            "description": "Maximize your 80C deduction with ELSS, PPF, or life insurance premium.",
+            "potential_saving": saving[1],
+            "priority": "high",
+        })
+
+    if room_80ccd and saving[2] > 0:
+        suggestions.append({
+            "category": "Section 80CCD(1B)",
+            "title": f"Invest ₹{room_80ccd:,.0f} in NPS",
+            "description": "Additional NPS contribution beyond 80C limit for extra deduction.",
+            "potential_saving": saving[2],
+            "priority": "medium",
+        })
+
+    if room_80d and saving[3] > 0:
+        suggestions.append({
+            "category": "Section 80D",
+            "title": "Get health insurance coverage",
+            "description": f"Claim up to ₹{room_80d:,.0f} more for health insurance premiums.",
+            "potential_saving": saving[3],
+            "priority": "medium",
+        })
+
+    if home_loan == 0 and income.salary > 1000000 and saving[4] > 0:
+        suggestions.append({
+            "category": "Home Loan Interest",
+            "title": "Consider home loan for tax benefit",
+            "description": f"Section 24 allows up to ₹{rules.cap_home_loan_interest:,.0f} deduction on home loan interest.",
+            "potential_saving": saving[4],
+            "priority": "low",
+        })
+
+    plan = _pick_plan(amounts, old_tax[5:], new_tax, headroom, None, financial_year)
+    if plan["savings"] > 0 and plan["invest"] > 0:
+        suggestions.append({
+            "category": "Investment Plan",
+            "title": f"Invest ₹{plan['invest']:,.0f} across 80C, 80CCD(1B) and 80D",
+            "description": (
+                "This is the lowest tax you can reach with these sections; investing more saves nothing further."
+                if plan["invest"] < sum(headroom.values())
+                else "Using your full 80C, 80CCD(1B) and 80D allowance gives the lowest tax."
+            ),
+            "potential_saving": plan["savings"],
+            "priority": "high",
+            "allocation": plan["allocation"],
+        })
+
+    if float(old_tax[0]) != new_tax:
+        better, worse = ("old", "new") if float(old_tax[0]) < new_tax else ("new", "old")
+        suggestions.append({
+            "category": "Regime Comparison",
+            "title": f"The {better} regime is cheaper for you",
+            "description": f"With your current income and deductions, the {better} regime saves "
+                           f"₹{abs(float(old_tax[0]) - new_tax):,.0f} over the {worse} regime.",
+            "potential_saving": round(abs(float(old_tax[0]) - new_tax), 2),
+            "priority": "high",
+        })
+
+    if not suggestions:
+        suggestions.append({
+            "category": "Optimized",
+            "title": "Your tax planning looks optimized!",
+            "description": "You are utilizing most available deductions. Keep up the good work.",
+            "potential_saving": 0,
+            "priority": "low",
+        })
+
+    return suggestions
@@ -0,0 +1,239 @@
+"""Background document parsing — fills `Document.parsed_data` off the request path.
+
+Uploads of parseable documents (Form 16, salary slips) call `enqueue` once
+their row is committed; nothing is parsed while the client waits. A bounded
+asyncio queue feeds `PARSE_POOL_WORKERS` consumer tasks, each handing one
+document at a time to a small process pool running services.document_parser
+(text extraction is pure Python and would otherwise hold the GIL).
+
+- Backpressure: when the queue is full `enqueue` drops the document instead
+  of blocking the upload; the sweep (at startup, then every
+  `PARSE_SWEEP_INTERVAL` seconds) queues every unparsed document, waiting for
+  room as it goes. The sweep also picks up whatever a restart interrupted.
+- Content already parsed for another document (same SHA-256 and type) is
+  copied rather than parsed again.
+- Failures: a document the parser rejects, or whose file is missing, is
+  stored as `{"status": "failed", "error": ...}` at once; crashes and timeouts are
+  retried `PARSE_MAX_ATTEMPTS` times with exponential backoff first. Either
+  one replaces the process pool, terminating the old workers.
+- Metrics: `parse.<stage>` timers for queue wait, extraction, parsing and
+  storing; `parse.{parsed,reused,failed,retried,dropped}` counters and the
+  `parse.queue_depth` gauge.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+
+from sqlalchemy import select, update
+
+from backend.config import settings
+from backend.database import async_session
+from backend.models.document import Document
+from backend.services.document_parser import (
+    PARSEABLE_DOC_TYPES, PARSER_VERSION, DocumentParseError, parse_document,
+)
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_queue: asyncio.Queue[tuple[str, int, float]] | None = None  # (document id, attempt, enqueued at)
+_queued: set[str] = set()  # ids queued, in progress or waiting to be retried
+_tasks: list[asyncio.Task] = []
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PARSE_POOL_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _reset_pool():
+    """Drop the pool after a crash or timeout, terminating its workers.
+
+    A timed-out parse may never return, so its worker is killed rather than
+    left running next to the fresh pool the retry starts.
+    """
+    global _pool
+    if _pool is not None:
+        workers = list((_pool._processes or {}).values())
+        _pool.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        _pool = None
+
+
+def _put(doc_id: str, attempt: int):
+    if _queue is None:  # not running (e.g. scripts) — the sweep after the next startup takes it
+        _queued.discard(doc_id)
+        return
+    try:
+        _queue.put_nowait((doc_id, attempt, time.perf_counter()))
+    except asyncio.QueueFull:
+        metrics.inc("parse.dropped")
+        _queued.discard(doc_id)
+        return
+    metrics.set_gauge("parse.queue_depth", _queue.qsize())
+
+
+def enqueue(doc_id: str):
+    """Queue a committed document for parsing without waiting; a full queue leaves it to the sweep."""
+    if doc_id not in _queued:
+        _queued.add(doc_id)
+        _put(doc_id, 1)
+
+
+# ─── Stages ───
+
+async def _store(doc_id: str, parsed_data: dict):
+    start = time.perf_counter()
+    async with async_session() as db:
+        await db.execute(
+            update(Document)
+            .where(Document.id == doc_id, Document.parsed_data.is_(None))
+            .values(parsed_data=parsed_data)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    metrics.observe("parse.store", time.perf_counter() - start)
+
+
+async def _previous_result(db, doc: Document) -> dict | None:
+    """parsed_data of another document with the same content, if this parser version produced it."""
+    if doc.sha256 is None:
+        return None
+    rows = (await db.execute(
+        select(Document.parsed_data)
+        .where(Document.sha256 == doc.sha256, Document.doc_type == doc.doc_type,
+               Document.id != doc.id, Document.parsed_data.is_not(None))
+        .limit(5)
+    )).scalars()
+    return next(
+        (data for data in rows if data.get("status") == "parsed" and data.get("parser_version") == PARSER_VERSION),
+        None,
+    )
+
+
+async def _process(doc_id: str, attempt: int) -> bool:
+    """Parse (or copy) one document's data; True if a retry has been scheduled instead."""
+    async with async_session() as db:
+        doc = (await db.execute(
+            select(Document).where(Document.id == doc_id, Document.parsed_data.is_(None))
+        )).scalar_one_or_none()
+        if doc is None:
+            return False  # deleted, or parsed meanwhile
+        previous = await _previous_result(db, doc)
+    if previous is not None:
+        await _store(doc_id, previous)
+        metrics.inc("parse.reused")
+        return False
+
+    loop = asyncio.get_running_loop()
+    try:
+        parsed, timings = await asyncio.wait_for(
+            loop.run_in_executor(_get_pool(), parse_document, doc.file_path, doc.mime_type, doc.filename, doc.doc_type),
+            settings.PARSE_TIMEOUT,
+        )
+    except DocumentParseError as e:
+        await _store(doc_id, {"status": "failed", "error": str(e), "parser_version": PARSER_VERSION})
+        metrics.inc("parse.failed")
+        return False
+    except FileNotFoundError:
+        # The stored file is gone; retrying cannot bring it back
+        logger.error("Parsing document %s failed: file %s is missing", doc_id, doc.file_path)
+        await _store(doc_id, {"status": "failed", "error": "Document file is missing", "parser_version": PARSER_VERSION})
+        metrics.inc("parse.failed")
+        return False
+    except Exception as e:
+        if isinstance(e, (asyncio.TimeoutError, BrokenProcessPool)):
+            _reset_pool()  # start fresh processes for the retry
+        if attempt < settings.PARSE_MAX_ATTEMPTS:
+            metrics.inc("parse.retried")
+            delay = settings.PARSE_RETRY_DELAY * 2 ** (attempt - 1)
+            logger.warning("Parsing document %s failed (attempt %d), retrying in %.1fs: %r", doc_id, attempt, delay, e)
+            loop.call_later(delay, _put, doc_id, attempt + 1)
+            return True
+        logger.error("Parsing document %s failed after %d attempts: %r", doc_id, attempt, e)
+        await _store(doc_id, {"status": "failed", "error": "Parsing did not complete", "parser_version": PARSER_VERSION})
+        metrics.inc("parse.failed")
+        return False
+
+    for stage, seconds in timings.items():
+        metrics.observe(f"parse.{stage}", seconds)
+    await _store(doc_id, parsed)
+    metrics.inc("parse.parsed")
+    return False
+
+
+async def _consume():
+    while True:
+        doc_id, attempt, enqueued = await _queue.get()
+        metrics.set_gauge("parse.queue_depth", _queue.qsize())
+        metrics.observe("parse.wait", time.perf_counter() - enqueued)
+        retrying = False
+        try:
+            retrying = await _process(doc_id, attempt)
+        except Exception:
+            logger.exception("Parsing document %s failed", doc_id)  # e.g. the database is down; the sweep retries
+        finally:
+            if not retrying:
+                _queued.discard(doc_id)  # a scheduled retry keeps it, so the sweep leaves it alone
+            _queue.task_done()
+
+
+async def sweep():
+    """Queue every unparsed document not already queued, waiting for room in the queue."""
+    async with async_session() as db:
+        ids = (await db.execute(
+            select(Document.id)
+            .where(Document.parsed_data.is_(None), Document.doc_type.in_(PARSEABLE_DOC_TYPES))
+            .order_by(Document.uploaded_at)
+        )).scalars().all()
+    for doc_id in ids:
+        if doc_id not in _queued:
+            _queued.add(doc_id)
+            await _queue.put((doc_id, 1, time.perf_counter()))
+            metrics.set_gauge("parse.queue_depth", _queue.qsize())
+
+
+async def _sweep_periodically(interval: float):
+    while True:
+        try:
+            await sweep()
+        except Exception:
+            metrics.inc("parse.sweep_errors")  # keep going; retry next interval
+        await asyncio.sleep(interval)
+
+
+# ─── Lifecycle ───
+
+def start():
+    """Start the consumers and the sweep (from the app lifespan)."""
+    global _queue
+    _queue = asyncio.Queue(maxsize=settings.PARSE_QUEUE_SIZE)
+    _tasks.extend(asyncio.create_task(_consume()) for _ in range(settings.PARSE_POOL_WORKERS))
+    _tasks.append(asyncio.create_task(_sweep_periodically(settings.PARSE_SWEEP_INTERVAL)))
+
+
+async def stop():
+    """Cancel the pipeline; queued documents are picked up by the sweep after the next start."""
+    global _queue
+    for task in _tasks:
+        task.cancel()
+    for task in _tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    _tasks.clear()
+    _queued.clear()
+    _queue = None
+    _reset_pool()
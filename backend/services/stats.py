@@ -0,0 +1,135 @@
+"""Incrementally maintained counters behind the admin dashboard.
+
+Handlers that create, transition or delete users, filings and documents
+`bump` the matching counters in the same transaction, so the dashboard is a
+single read of a few dozen rows instead of COUNT scans. `reconcile`
+recomputes every counter from the source tables; a schema migration runs it
+once to seed counters for an existing database, and a background task runs
+it periodically to repair any drift from writes made outside the API.
+
+Counter names: "users", "documents", "filings", and per-filing breakdowns
+"filings.status.<status>", "filings.regime.<regime>", "filings.itr_type.<type>".
+"""
+
+import asyncio
+from collections import Counter
+from typing import Mapping
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.database import async_session
+from backend.models.document import Document
+from backend.models.filing import Filing
+from backend.models.stat_counter import StatCounter
+from backend.models.user import User
+from backend.utils.metrics import metrics
+
+_FILING_BREAKDOWNS = (
+    (Filing.status, "filings.status."),
+    (Filing.regime, "filings.regime."),
+    (Filing.itr_type, "filings.itr_type."),
+)
+
+
+def filing_counters(status: str, regime: str, itr_type: str) -> dict[str, int]:
+    """Counters one filing contributes to."""
+    return {
+        "filings": 1,
+        f"filings.status.{status}": 1,
+        f"filings.regime.{regime}": 1,
+        f"filings.itr_type.{itr_type}": 1,
+    }
+
+
+def transition(before: Mapping[str, int], after: Mapping[str, int]) -> dict[str, int]:
+    """Deltas that move an entity's contribution from `before` to `after`."""
+    deltas = Counter(after)
+    deltas.subtract(before)
+    return {name: delta for name, delta in deltas.items() if delta}
+
+
+def _insert(db: AsyncSession):
+    return pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
+
+
+async def bump(db: AsyncSession, deltas: Mapping[str, int]):
+    """Add `deltas` to the counters in one upsert, inside the caller's transaction."""
+    rows = [{"name": name, "value": delta} for name, delta in sorted(deltas.items()) if delta]
+    if not rows:
+        return
+    # Sorted names give concurrent transactions the same row-lock order (no deadlocks)
+    stmt = _insert(db)(StatCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StatCounter.name], set_={"value": StatCounter.value + stmt.excluded.value}
+    )
+    await db.execute(stmt)
+
+
+async def read_stats(db: AsyncSession) -> dict:
+    """Dashboard numbers from the counters (one query)."""
+    counters = dict((await db.execute(select(StatCounter.name, StatCounter.value))).all())
+
+    def breakdown(prefix: str) -> dict[str, int]:
+        return {name[len(prefix):]: value for name, value in counters.items() if name.startswith(prefix) and value}
+
+    by_status = breakdown("filings.status.")
+    return {
+        "total_users": counters.get("users", 0),
+        "total_filings": counters.get("filings", 0),
+        "total_documents": counters.get("documents", 0),
+        "submitted_filings": by_status.get("submitted", 0) + by_status.get("filed", 0),
+        "filings_by_status": by_status,
+        "filings_by_regime": breakdown("filings.regime."),
+        "filings_by_itr_type": breakdown("filings.itr_type."),
+    }
+
+
+async def _lock_counters(db: AsyncSession):
+    """Hold off every `bump` until the caller's transaction ends.
+
+    Postgres: a table lock that conflicts with the bumps' row writes (new
+    counter rows included) but not with reads. SQLite: any write takes the
+    database's single write lock.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.execute(text("LOCK TABLE stat_counters IN SHARE ROW EXCLUSIVE MODE"))
+    else:
+        await db.execute(update(StatCounter).values(value=StatCounter.value))
+
+
+async def reconcile(db: AsyncSession):
+    """Recompute every counter from the source tables and store the values, in the caller's transaction.
+
+    The counters are locked before counting, so a bump either committed
+    before the counts (and is in them) or waits and applies on top.
+    """
+    await _lock_counters(db)
+    counts = {
+        "users": await db.scalar(select(func.count()).select_from(User)),
+        "filings": await db.scalar(select(func.count()).select_from(Filing)),
+        "documents": await db.scalar(select(func.count()).select_from(Document)),
+    }
+    for column, prefix in _FILING_BREAKDOWNS:
+        for value, count in (await db.execute(select(column, func.count()).group_by(column))).all():
+            counts[f"{prefix}{value}"] = count
+
+    stmt = _insert(db)(StatCounter).values([{"name": name, "value": value} for name, value in sorted(counts.items())])
+    await db.execute(stmt.on_conflict_do_update(index_elements=[StatCounter.name], set_={"value": stmt.excluded.value}))
+    # Counters nothing contributes to any more (e.g. the last filing left a status)
+    await db.execute(update(StatCounter).where(StatCounter.name.not_in(counts)).values(value=0))
+    metrics.inc("stats.reconciliations")
+
+
+async def reconcile_periodically(interval: float):
+    """Background task: reconcile every `interval` seconds (the first run is one interval after startup)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as db:
+                await reconcile(db)
+                await db.commit()
+        except Exception:
+            metrics.inc("stats.reconciliation_errors")  # keep serving; retry next interval
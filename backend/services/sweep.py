@@ -0,0 +1,71 @@
+"""What-if sweeps — tax for both regimes over a grid of scenarios in one engine pass."""
+
+import numpy as np
+
+from backend.schemas.filing import DeductionData, IncomeData
+from backend.services.batch_engine import DEDUCTION_DEFAULTS, compare_regimes_batch
+from backend.services.tax_rules import DEFAULT_FINANCIAL_YEAR
+
+
+def _break_even(x: np.ndarray, diff: np.ndarray) -> list[list[float]]:
+    """Values of `x` where `diff` (old − new tax) changes sign, per column of `diff`.
+
+    A crossing into an exact tie is reported at the tie only when the sign on
+    the far side of the tie is opposite; ties the curves merely touch are not
+    break-even points. Leading ties have no side to switch from and are skipped.
+    """
+    n = len(x)
+    sign = np.sign(diff)
+    # Index of the next non-tie point at or after each row (n if none)
+    nonzero_at = np.where(sign != 0, np.arange(n)[:, None], n)
+    next_nonzero = np.minimum.accumulate(nonzero_at[::-1], axis=0)[::-1]
+    next_sign = np.take_along_axis(np.vstack([sign, np.zeros((1, sign.shape[1]))]), next_nonzero, axis=0)
+
+    left, right = sign[:-1], sign[1:]
+    strict = (left * right) < 0
+    into_tie = (left != 0) & (right == 0) & (next_sign[1:] * left < 0)
+
+    # Linear interpolation inside strictly crossing intervals, exact x at ties
+    d0, d1 = diff[:-1], diff[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(strict, d0 / (d0 - d1), 1.0)
+    at = x[:-1, None] + (x[1:] - x[:-1])[:, None] * frac
+
+    crossings = [[] for _ in range(diff.shape[1])]
+    rows, cols = np.nonzero(strict | into_tie)
+    for row, col in zip(rows, cols):
+        crossings[col].append(round(float(at[row, col]), 2))
+    return crossings
+
+
+def sweep_tax(
+    income: IncomeData, deductions: DeductionData,
+    axes: list[tuple[str, np.ndarray]],
+    financial_year: str = DEFAULT_FINANCIAL_YEAR,
+) -> dict:
+    """Total tax under both regimes over the grid spanned by one or two varying fields.
+
+    `axes` is a list of (field, values) pairs naming `IncomeData` / `DeductionData`
+    fields; all other fields stay at their values in `income` / `deductions`.
+    Tax grids are shaped (len(axis 0),) or (len(axis 0), len(axis 1)); break-even
+    points are located along axis 0 (per axis-1 value for 2-D grids).
+    """
+    grids = np.meshgrid(*(values for _, values in axes), indexing="ij")
+    shape = grids[0].shape
+    varying = {field: grid.ravel() for (field, _), grid in zip(axes, grids)}
+
+    income_columns = {**income.model_dump(), **{f: v for f, v in varying.items() if f not in DEDUCTION_DEFAULTS}}
+    deduction_columns = {**deductions.model_dump(), **{f: v for f, v in varying.items() if f in DEDUCTION_DEFAULTS}}
+    result = compare_regimes_batch(income_columns, deduction_columns, 0, financial_year)
+
+    old_tax = result.old_regime.total_tax.reshape(shape)
+    new_tax = result.new_regime.total_tax.reshape(shape)
+    diff = (old_tax - new_tax).reshape(shape[0], -1)
+    break_even = _break_even(np.asarray(axes[0][1], dtype=np.float64), diff)
+
+    return {
+        "axes": [{"field": field, "values": np.asarray(values).tolist()} for field, values in axes],
+        "old_regime": old_tax.tolist(),
+        "new_regime": new_tax.tolist(),
+        "break_even": break_even[0] if len(axes) == 1 else break_even,
+    }
@@ -0,0 +1,122 @@
+"""Per-financial-year tax rule registry.
+
+Each financial year's slabs, deduction caps, 87A rebates and surcharge bands
+are declared below as plain data. `get_rules` compiles a year's spec into
+lookup tables the first time it is asked for and memoizes the result, so
+requests only ever pay a dict lookup.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from backend.services.tax_tables import SlabTable, SurchargeTable
+
+DEFAULT_FINANCIAL_YEAR = "2025-2026"
+
+_INF = float("inf")
+
+_SURCHARGE_BANDS = [
+    (5000000, 0.00),
+    (10000000, 0.10),
+    (20000000, 0.15),
+    (50000000, 0.25),
+    (_INF, 0.37),
+]
+
+_RULE_SPECS = {
+    # FY 2024-25 / AY 2025-26 — Budget July 2024
+    "2024-2025": {
+        "assessment_year": "2025-2026",
+        "old_slabs": [(250000, 0.00), (500000, 0.05), (1000000, 0.20), (_INF, 0.30)],
+        "old_rebate": (500000, 12500),
+        "new_slabs": [
+            (300000, 0.00),
+            (700000, 0.05),
+            (1000000, 0.10),
+            (1200000, 0.15),
+            (1500000, 0.20),
+            (_INF, 0.30),
+        ],
+        "new_rebate": (700000, 25000),
+        "surcharge": _SURCHARGE_BANDS,
+        "cess_rate": 0.04,
+        "standard_deduction_old": 50000,
+        "standard_deduction_new": 75000,
+        "cap_80c": 150000,
+        "cap_80ccd_1b": 50000,
+        "cap_80d": 25000,
+        "cap_home_loan_interest": 200000,
+    },
+    # FY 2025-26 / AY 2026-27 — Budget 2025
+    "2025-2026": {
+        "assessment_year": "2026-2027",
+        "old_slabs": [(250000, 0.00), (500000, 0.05), (1000000, 0.20), (_INF, 0.30)],
+        "old_rebate": (500000, 12500),
+        "new_slabs": [
+            (400000, 0.00),
+            (800000, 0.05),
+            (1200000, 0.10),
+            (1600000, 0.15),
+            (2000000, 0.20),
+            (2400000, 0.25),
+            (_INF, 0.30),
+        ],
+        "new_rebate": (1200000, 60000),
+        "surcharge": _SURCHARGE_BANDS,
+        "cess_rate": 0.04,
+        "standard_deduction_old": 75000,
+        "standard_deduction_new": 75000,
+        "cap_80c": 150000,
+        "cap_80ccd_1b": 50000,
+        "cap_80d": 25000,
+        "cap_home_loan_interest": 200000,
+    },
+}
+
+SUPPORTED_FINANCIAL_YEARS = tuple(_RULE_SPECS)
+
+
+@dataclass(frozen=True)
+class TaxRules:
+    """Compiled rules for one financial year."""
+
+    financial_year: str
+    assessment_year: str
+    old_slabs: SlabTable
+    new_slabs: SlabTable
+    surcharge: SurchargeTable
+    cess_rate: float
+    standard_deduction_old: float
+    standard_deduction_new: float
+    cap_80c: float
+    cap_80ccd_1b: float
+    cap_80d: float
+    cap_home_loan_interest: float
+
+
+@lru_cache(maxsize=None)
+def get_rules(financial_year: str = DEFAULT_FINANCIAL_YEAR) -> TaxRules:
+    """Return the compiled rules for `financial_year` (e.g. "2025-2026").
+
+    Raises ValueError for years with no registered rules.
+    """
+    spec = _RULE_SPECS.get(financial_year)
+    if spec is None:
+        raise ValueError(f"No tax rules for financial year {financial_year}")
+
+    old_limit, old_rebate = spec["old_rebate"]
+    new_limit, new_rebate = spec["new_rebate"]
+    return TaxRules(
+        financial_year=financial_year,
+        assessment_year=spec["assessment_year"],
+        old_slabs=SlabTable(spec["old_slabs"], rebate_limit=old_limit, rebate=old_rebate),
+        new_slabs=SlabTable(spec["new_slabs"], rebate_limit=new_limit, rebate=new_rebate),
+        surcharge=SurchargeTable(spec["surcharge"]),
+        cess_rate=spec["cess_rate"],
+        standard_deduction_old=spec["standard_deduction_old"],
+        standard_deduction_new=spec["standard_deduction_new"],
+        cap_80c=spec["cap_80c"],
+        cap_80ccd_1b=spec["cap_80ccd_1b"],
+        cap_80d=spec["cap_80d"],
+        cap_home_loan_interest=spec["cap_home_loan_interest"],
+    )
@@ -0,0 +1,59 @@
+"""Compiled tax rule tables.
+
+Slab and surcharge schedules are compiled once into sorted breakpoints with
+the tax already accumulated up to each breakpoint, so a lookup is one binary
+search plus one multiply instead of a walk over every slab. The schedules
+themselves are declared per financial year in `tax_rules`.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class SlabTable:
+    """Progressive slab schedule with an optional Section 87A rebate."""
+
+    __slots__ = ("breakpoints", "rates", "cumulative", "rebate_limit", "rebate")
+
+    def __init__(self, slabs: list[tuple[float, float]], rebate_limit: float = 0, rebate: float = 0):
+        """`slabs` is a list of (upper_limit, rate) pairs in ascending order."""
+        breakpoints = [0]
+        rates = []
+        cumulative = [0.0]
+        for limit, rate in slabs:
+            rates.append(rate)
+            if limit != float("inf"):
+                cumulative.append(cumulative[-1] + (limit - breakpoints[-1]) * rate)
+                breakpoints.append(limit)
+        self.breakpoints = tuple(breakpoints)
+        self.rates = tuple(rates)
+        self.cumulative = tuple(cumulative)
+        self.rebate_limit = rebate_limit
+        self.rebate = rebate
+
+    def tax(self, taxable_income: float) -> float:
+        """Tax after the Section 87A rebate."""
+        if taxable_income <= 0:
+            return 0.0
+        i = bisect_right(self.breakpoints, taxable_income) - 1
+        tax = self.cumulative[i] + (taxable_income - self.breakpoints[i]) * self.rates[i]
+        if taxable_income <= self.rebate_limit:
+            tax = max(0, tax - self.rebate)
+        return tax
+
+
+class SurchargeTable:
+    """Surcharge bands keyed on taxable income (upper limits inclusive)."""
+
+    __slots__ = ("limits", "rates")
+
+    def __init__(self, bands: list[tuple[float, float]]):
+        """`bands` is a list of (upper_limit, rate) pairs in ascending order."""
+        self.limits = tuple(limit for limit, _ in bands if limit != float("inf"))
+        self.rates = tuple(rate for _, rate in bands)
+
+    def surcharge(self, tax: float, taxable_income: float) -> float:
+        if taxable_income <= self.limits[0] and not self.rates[0]:
+            return 0  # common case: below the first surcharge band
+        rate = self.rates[bisect_left(self.limits, taxable_income)]
+        return tax * rate if rate else 0
+
@@ -0,0 +1,178 @@
+"""File downloads with conditional requests and byte ranges.
+
+`file_response` answers from what the caller already knows about the file
+(a validator and a modification time from the database): a matching
+`If-None-Match` / `If-Modified-Since` gets 304 before the file is opened.
+Otherwise the file is opened and sent whole (200) or, for a single
+`Range: bytes=...` (honoured only if `If-Range` still matches), as 206. Other
+range requests (several ranges, unknown units) are answered with the whole
+file, as RFC 9110 allows.
+
+The body goes out through the ASGI `http.response.zerocopy` extension
+(sendfile) when the server offers it; otherwise it is read in chunks in a
+worker thread with `os.pread`.
+"""
+
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Receive, Scope, Send
+
+from backend.utils.metrics import metrics
+
+_CHUNK_SIZE = 256 * 1024
+_BYTE_RANGE = re.compile(r"bytes=(\d*)-(\d*)", re.IGNORECASE)
+
+# Stored content types come from the uploader — only these are shown inline
+_INLINE_TYPES = {"application/pdf", "image/png", "image/jpeg", "image/gif", "image/webp", "text/plain"}
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match list against our (strong) ETag."""
+    candidates = [c.strip().removeprefix("W/") for c in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _not_modified(request: Request, etag: str | None, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:  # takes precedence over If-Modified-Since
+        return etag is not None and _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified.timestamp()) <= since.timestamp()
+    return False
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """`(start, end)` inclusive for a single `bytes=` range; None to send the whole file.
+
+    Raises 416 for a well-formed range that lies beyond the file.
+    """
+    match = _BYTE_RANGE.fullmatch(header.strip())
+    if match is None or not (match[1] or match[2]):
+        return None
+    if match[1]:
+        start = int(match[1])
+        end = min(int(match[2]), size - 1) if match[2] else size - 1
+        if match[2] and int(match[2]) < start:
+            return None  # invalid — ignored
+    else:  # suffix: the final N bytes
+        start, end = max(size - int(match[2]), 0), size - 1
+        if int(match[2]) == 0:
+            start = size
+    if start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
+def _if_range_matches(request: Request, etag: str | None, last_modified: datetime) -> bool:
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if if_range.startswith('"'):
+        return etag is not None and if_range == etag  # strong comparison
+    return if_range == formatdate(last_modified.timestamp(), usegmt=True)
+
+
+class _FileRangeResponse(Response):
+    """Sends `count` bytes of an open file from `offset`, closing it afterwards."""
+
+    def __init__(self, fd: int, offset: int, count: int, status_code: int, headers: dict[str, str], media_type: str):
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.headers["content-length"] = str(count)
+        self.fd, self.offset, self.count = fd, offset, count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        try:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                with os.fdopen(os.dup(self.fd), "rb") as file:
+                    await send({
+                        "type": "http.response.zerocopy", "file": file,
+                        "offset": self.offset, "count": self.count, "more_body": False,
+                    })
+            else:
+                offset, remaining = self.offset, self.count
+                while remaining > 0:
+                    chunk = await run_in_threadpool(os.pread, self.fd, min(_CHUNK_SIZE, remaining), offset)
+                    if not chunk:
+                        break  # truncated under us — the client sees a short body
+                    offset += len(chunk)
+                    remaining -= len(chunk)
+                    await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+                if remaining > 0:
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
+            metrics.inc("downloads.bytes", self.count)
+        finally:
+            os.close(self.fd)
+
+
+def _open(path: str) -> tuple[int, int]:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return fd, os.fstat(fd).st_size
+    except BaseException:
+        os.close(fd)
+        raise
+
+
+async def file_response(
+    request: Request,
+    path: str,
+    *,
+    etag: str | None,
+    last_modified: datetime,
+    media_type: str | None,
+    filename: str,
+) -> Response:
+    """A 200 / 206 / 304 response for the stored file at `path` (see module docstring)."""
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    headers = {
+        "Last-Modified": formatdate(last_modified.timestamp(), usegmt=True),
+        "Cache-Control": "private, no-cache",  # always revalidate — cheap, and deletions take effect
+    }
+    if etag is not None:
+        headers["ETag"] = etag
+    if _not_modified(request, etag, last_modified):
+        metrics.inc("downloads.not_modified")
+        return Response(status_code=304, headers=headers)
+
+    try:
+        fd, size = await run_in_threadpool(_open, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Document content is missing")
+
+    media_type = media_type or "application/octet-stream"
+    disposition = "inline" if media_type in _INLINE_TYPES else "attachment"
+    quoted = quote(filename)
+    headers["Content-Disposition"] = (
+        f'{disposition}; filename="{filename}"' if quoted == filename
+        else f"{disposition}; filename*=utf-8''{quoted}"
+    )
+    headers["Accept-Ranges"] = "bytes"
+    headers["X-Content-Type-Options"] = "nosniff"
+
+    status_code, offset, count = 200, 0, size
+    range_header = request.headers.get("range")
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = _parse_range(range_header, size)
+        except HTTPException:
+            os.close(fd)
+            raise
+        if byte_range is not None:
+            start, end = byte_range
+            status_code, offset, count = 206, start, end - start + 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            metrics.inc("downloads.partial")
+    return _FileRangeResponse(fd, offset, count, status_code, headers, media_type)
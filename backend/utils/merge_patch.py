@@ -0,0 +1,20 @@
+"""JSON merge patch (RFC 7386)."""
+
+MERGE_PATCH_MEDIA_TYPE = "application/merge-patch+json"
+
+
+def apply_merge_patch(target, patch):
+    """Return `target` with `patch` applied; neither argument is modified.
+
+    Objects merge member by member, a null member removes that member, and
+    any other value (arrays included) replaces the target outright.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
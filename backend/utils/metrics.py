@@ -0,0 +1,68 @@
+"""In-process metrics — counters, gauges and timers, served at /api/admin/metrics."""
+
+from collections import defaultdict
+from typing import Callable
+
+
+class Timer:
+    """Running count / total / max of observed durations (seconds)."""
+
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 6),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class Metrics:
+    """Named counters, gauges and timers.
+
+    Not thread-safe — update from the event loop (or accept a lost increment).
+    """
+
+    def __init__(self):
+        self.counters: defaultdict[str, int] = defaultdict(int)
+        self.gauges: dict[str, float] = {}
+        self.timers: defaultdict[str, Timer] = defaultdict(Timer)
+        self._collectors: list[Callable[[], dict[str, float]]] = []
+
+    def inc(self, name: str, value: int = 1):
+        self.counters[name] += value
+
+    def set_gauge(self, name: str, value: float):
+        self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        self.timers[name].observe(seconds)
+
+    def add_collector(self, collector: Callable[[], dict[str, float]]):
+        """Register a function returning gauges that are read at snapshot time."""
+        self._collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        gauges = dict(self.gauges)
+        for collector in self._collectors:
+            gauges.update(collector())
+        return {
+            "counters": dict(self.counters),
+            "gauges": gauges,
+            "timers": {name: timer.snapshot() for name, timer in self.timers.items()},
+        }
+
+
+metrics = Metrics()
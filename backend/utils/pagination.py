@@ -0,0 +1,63 @@
+"""Keyset (cursor) pagination for newest-first listings.
+
+Pages are ordered by (timestamp, id) descending and the next page starts
+strictly after the last row returned, so every page is one index range scan
+no matter how deep the client pages — unlike OFFSET, which re-reads every
+skipped row. The cursor for the next page is sent in the `X-Next-Cursor`
+response header; it is absent on the last page.
+"""
+
+import base64
+from datetime import datetime
+from typing import Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """Dependency for `?cursor=&limit=` query parameters."""
+
+    def __init__(
+        self,
+        cursor: str | None = Query(default=None, description="X-Next-Cursor from the previous page"),
+        limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(timestamp: datetime, id_: str) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{id_}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        timestamp, id_ = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), id_
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(
+    stmt: Select, timestamp: InstrumentedAttribute, id_: InstrumentedAttribute, page: PageParams,
+) -> Select:
+    """Restrict `stmt` to one page, newest first (fetches one extra row to detect a next page)."""
+    if page.cursor:
+        stmt = stmt.where(tuple_(timestamp, id_) < tuple_(*decode_cursor(page.cursor)))
+    return stmt.order_by(timestamp.desc(), id_.desc()).limit(page.limit + 1)
+
+
+def page_rows(rows: Sequence, page: PageParams, response: Response, timestamp_key: str) -> Sequence:
+    """Trim the look-ahead row and set `X-Next-Cursor` if there is another page."""
+    if len(rows) <= page.limit:
+        return rows
+    rows = rows[:page.limit]
+    last = rows[-1]
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(getattr(last, timestamp_key), last.id)
+    return rows
@@ -1,27 +1,85 @@
-"""Security utilities — JWT token generation and password hashing."""
+"""Security utilities — JWT token generation and password hashing.
 
+Authenticated-user resolution is cached: verified tokens map to their
+subject until they expire, and user rows are cached by id for
+`AUTH_CACHE_TTL` seconds. Code that changes a user row must call
+`invalidate_user`; changes made outside this process (e.g. `make_admin.py`)
+show up once the TTL lapses.
+
+bcrypt runs on a small dedicated thread pool (the C extension releases the
+GIL), so a burst of logins queues there instead of freezing the event loop.
+When the queue is full, requests are shed with 503 + Retry-After.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from backend.config import settings
-from backend.database import get_db
+from backend.database import get_read_db
+from backend.utils.cache import TTLCache
+from backend.utils.metrics import metrics
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# token -> (user id, exp); user id -> column values of the users row
+_token_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+_user_cache = TTLCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL)
+
+
+# ─── Password hashing ───
+
+_password_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_password_jobs = 0  # running + queued
+
+
+async def _run_password_job(name: str, fn, *args):
+    """Run a bcrypt call on the password pool, shedding load once the queue is full."""
+    global _password_jobs
+    if _password_jobs >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE:
+        metrics.inc("auth.password.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    submitted = time.perf_counter()
+    started = submitted
+
+    def job():
+        nonlocal started
+        started = time.perf_counter()
+        return fn(*args)
+
+    _password_jobs += 1
+    metrics.set_gauge("auth.password.queue_depth", _password_jobs)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_pool, job)
+    finally:
+        _password_jobs -= 1
+        metrics.set_gauge("auth.password.queue_depth", _password_jobs)
+        finished = time.perf_counter()
+        metrics.observe("auth.password.wait", started - submitted)
+        metrics.observe(f"auth.password.{name}", finished - started)
+
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+async def hash_password(password: str) -> str:
+    return await _run_password_job("hash", pwd_context.hash, password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+async def verify_password(plain: str, hashed: str) -> bool:
+    return await _run_password_job("verify", pwd_context.verify, plain, hashed)
 
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -33,11 +91,12 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db),
-):
-    """Dependency to extract and validate the current user from JWT."""
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> str:
+    """Dependency that validates the JWT and returns its subject without a DB lookup."""
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid authentication credentials",
@@ -50,11 +109,45 @@ async def get_current_user(
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    _token_cache.set(token, (user_id, payload.get("exp", float("inf"))))
+    return user_id
 
-    from models.user import User
 
+def invalidate_user(user_id: str):
+    """Drop a cached user row — call after changing it."""
+    _user_cache.pop(user_id)
+
+
+async def get_current_user(
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Dependency to extract and validate the current user from JWT.
+
+    The user is returned detached (rebuilt from the cache, or loaded through
+    the read-only session); `db.add()` it to a writable session before
+    changing it.
+    """
+    from backend.models.user import User
+
+    columns = _user_cache.get(user_id)
+    if columns is not None:
+        metrics.inc("auth.user_cache.hits")
+        user = User(**columns)
+        make_transient_to_detached(user)
+        return user
+
+    metrics.inc("auth.user_cache.misses")
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Closing detaches the user and hands the connection back now, not when
+    # the request ends, so a route on get_db never holds two at once.
+    await db.close()
+    _user_cache.set(user_id, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
     return user
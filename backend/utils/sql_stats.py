@@ -0,0 +1,85 @@
+"""Per-request SQL statistics: query count, DB time and N+1 detection.
+
+The engine hooks in database.py record every statement into the current
+request's QueryStats. This middleware installs a fresh one per request and,
+once the request finishes, adds it to the metrics registry by route
+("sql.request.<METHOD> <path>" timers, "sql.queries.<...>" counters). Requests
+over SQL_QUERY_BUDGET statements, or running one statement more than
+SQL_REPEAT_LIMIT times (the usual N+1 signature), are logged and counted. In
+DEBUG the numbers are also sent as X-DB-* response headers.
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import settings
+from backend.database import QueryStats, query_stats
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SQL_STATS_HEADERS = ["X-DB-Queries", "X-DB-Time-Ms", "X-DB-Slowest"]
+
+_STATEMENT_PREVIEW = 200  # characters of SQL shown in headers and log lines
+
+
+def _preview(statement: str) -> str:
+    return " ".join(statement.split())[:_STATEMENT_PREVIEW]
+
+
+def _route_name(scope: Scope) -> str:
+    route = scope.get("route")
+    return f"{scope['method']} {route.path}" if route is not None else f"{scope['method']} <unmatched>"
+
+
+def _record(scope: Scope, stats: QueryStats):
+    """Aggregate one request's statements into the metrics registry and flag it if over budget."""
+    if not stats.count:
+        return
+    route = _route_name(scope)
+    metrics.observe(f"sql.request.{route}", stats.total)
+    metrics.inc(f"sql.queries.{route}", stats.count)
+
+    if settings.SQL_QUERY_BUDGET and stats.count > settings.SQL_QUERY_BUDGET:
+        metrics.inc(f"sql.over_budget.{route}")
+        logger.warning(
+            "%s ran %d SQL statements (budget %d) in %.1f ms; slowest %.1f ms: %s",
+            route, stats.count, settings.SQL_QUERY_BUDGET, stats.total * 1000,
+            stats.slowest * 1000, _preview(stats.slowest_statement),
+        )
+    statement, times = stats.most_repeated()
+    if settings.SQL_REPEAT_LIMIT and times > settings.SQL_REPEAT_LIMIT:
+        metrics.inc(f"sql.repeated.{route}")
+        logger.warning("%s ran the same statement %d times (possible N+1): %s", route, times, _preview(statement))
+
+
+class SQLStatsMiddleware:
+    """ASGI middleware collecting the SQL statements each HTTP request runs."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Queries"] = str(stats.count)
+                headers["X-DB-Time-Ms"] = f"{stats.total * 1000:.1f}"
+                if stats.count:
+                    headers["X-DB-Slowest"] = f"{stats.slowest * 1000:.1f}ms {_preview(stats.slowest_statement)}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if settings.DEBUG else send)
+        finally:
+            query_stats.reset(token)
+            _record(scope, stats)
@@ -0,0 +1,270 @@
+"""Streaming multipart uploads.
+
+Declaring an `UploadFile` parameter makes FastAPI parse (and spool) the whole
+request before the handler runs, so an oversized upload is only rejected
+after all of it has arrived. `receive_upload` parses the body as it streams
+in instead: form fields are kept in memory (they are small), while the
+file part is written to a temp file (on the same filesystem as its final
+location) and hashed (SHA-256) on the way. The body is handed over in `UPLOAD_CHUNK_SIZE`
+pieces to a worker thread that does the parsing, hashing and writing.
+The request fails with 413 as soon as the file passes `MAX_UPLOAD_SIZE`;
+the caller then moves the finished file into place with an atomic rename
+(see `services.blobs`). `receive_uploads` does the same for a batch of
+file parts in one field, each in its own temp file.
+"""
+
+import hashlib
+import os
+import tempfile
+from contextlib import suppress
+from dataclasses import dataclass
+
+from fastapi import HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from backend.config import settings
+from backend.utils.metrics import metrics
+
+_MAX_FIELDS = 16
+_MAX_FIELD_SIZE = 64 * 1024
+_FORM_OVERHEAD = _MAX_FIELDS * _MAX_FIELD_SIZE  # multipart framing and fields on top of the file
+
+# OpenAPI description of the body, for routes that stream it with `receive_upload`
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "doc_type": {"type": "string", "default": "other"},
+            },
+        }}},
+    },
+}
+BATCH_UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["files"],
+            "properties": {
+                "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                "doc_type": {"type": "string", "default": "other"},
+            },
+        }}},
+    },
+}
+
+
+def _too_large(limit: int, what: str = "File") -> HTTPException:
+    return HTTPException(status_code=413, detail=f"{what} too large (max {limit // (1024 * 1024)}MB)")
+
+
+def _unlink(path: str):
+    with suppress(FileNotFoundError):
+        os.unlink(path)
+
+
+@dataclass(slots=True)
+class ReceivedUpload:
+    fields: dict[str, str]
+    filename: str | None
+    content_type: str | None
+    temp_path: str
+    size: int
+    sha256: str
+
+    async def discard(self):
+        await run_in_threadpool(_unlink, self.temp_path)
+
+
+class _Part:
+    __slots__ = ("headers", "name", "filename", "content_type", "data", "file", "sha256", "size")
+
+    def __init__(self):
+        self.headers: dict[bytes, bytes] = {}
+        self.name = ""
+        self.filename: str | None = None
+        self.content_type: str | None = None
+        self.data = bytearray()
+        # File parts only
+        self.file = None
+        self.sha256 = None
+        self.size = 0
+
+
+class _StreamingForm:
+    """Multipart parser writing each file part to its own temp file as it goes.
+
+    The parser is pure Python (~20 ms per MB), so it runs in a worker thread
+    together with the hashing and the writes; every method is called there.
+    """
+
+    def __init__(self, boundary: bytes, directory: str, file_field: str, max_files: int, limit: int):
+        os.makedirs(directory, exist_ok=True)
+        self.fields: dict[str, str] = {}
+        self.files: list[_Part] = []
+        self.size = 0  # all files
+        self._limit = limit
+        self._directory = directory
+        self._file_field = file_field
+        self._max_files = max_files
+        self._part = _Part()
+        self._header_name = self._header_value = b""
+        self._ended = False
+        self._parser = MultipartParser(boundary, {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_end": self._on_end,
+        })
+
+    def _on_part_begin(self):
+        self._part = _Part()
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_name += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._part.headers[self._header_name.lower()] = self._header_value
+        self._header_name = self._header_value = b""
+
+    def _on_headers_finished(self):
+        part = self._part
+        _, options = parse_options_header(part.headers.get(b"content-disposition", b""))
+        part.name = options.get(b"name", b"").decode("utf-8", "replace")
+        if b"filename" in options:
+            if part.name != self._file_field or len(self.files) >= self._max_files:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Only one file, in the '{self._file_field}' field" if self._max_files == 1
+                    else f"At most {self._max_files} files, in the '{self._file_field}' field",
+                )
+            part.filename = options[b"filename"].decode("utf-8", "replace")
+            part.content_type = part.headers.get(b"content-type", b"").decode("latin-1") or None
+            part.sha256 = hashlib.sha256()
+            self.files.append(part)  # before creating the file, so discard() finds it
+            part.file = tempfile.NamedTemporaryFile(dir=self._directory, prefix=".upload-", delete=False)
+        elif len(self.fields) >= _MAX_FIELDS:
+            raise HTTPException(status_code=400, detail="Too many form fields")
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        part = self._part
+        if part.file is not None:
+            part.size += end - start
+            self.size += end - start
+            if part.size > settings.MAX_UPLOAD_SIZE:
+                raise _too_large(settings.MAX_UPLOAD_SIZE)
+            if self.size > self._limit:  # only reachable with several files
+                raise _too_large(self._limit, "Upload")
+            chunk = data[start:end]
+            part.sha256.update(chunk)
+            part.file.write(chunk)
+        else:
+            self._part.data += data[start:end]
+            if len(self._part.data) > _MAX_FIELD_SIZE:
+                raise HTTPException(status_code=413, detail="Form field too large")
+
+    def _on_part_end(self):
+        if self._part.file is None:
+            self.fields[self._part.name] = self._part.data.decode("utf-8", "replace")
+        else:
+            self._part.file.close()
+
+    def _on_end(self):
+        self._ended = True
+
+    def feed(self, data: bytes):
+        try:
+            self._parser.write(data)
+        except MultipartParseError:
+            raise HTTPException(status_code=400, detail="Malformed multipart body")
+
+    def finish(self):
+        # The parser does not check this itself: a body cut off before the
+        # closing boundary would otherwise pass with a partial, unclosed file.
+        if not self._ended:
+            raise HTTPException(status_code=400, detail="Incomplete multipart body")
+        self._parser.finalize()
+
+    def discard(self):
+        for part in self.files:
+            if part.file is not None:
+                part.file.close()
+                _unlink(part.file.name)
+
+
+async def _receive(
+    request: Request, directory: str, file_field: str, max_files: int, limit: int,
+) -> list[ReceivedUpload]:
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
+    what = "File" if max_files == 1 else "Upload"
+    # Honest clients announce the size up front — refuse before reading anything
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit + _FORM_OVERHEAD:
+        raise _too_large(limit, what)
+
+    form = await run_in_threadpool(_StreamingForm, params[b"boundary"], directory, file_field, max_files, limit)
+    try:
+        received = 0
+        pending = bytearray()
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > limit + _FORM_OVERHEAD:
+                raise _too_large(limit, what)
+            pending += chunk
+            if len(pending) >= settings.UPLOAD_CHUNK_SIZE:
+                data = bytes(pending)
+                pending.clear()
+                await run_in_threadpool(form.feed, data)
+        await run_in_threadpool(form.feed, bytes(pending))
+        await run_in_threadpool(form.finish)
+        if not form.files:
+            raise RequestValidationError(
+                [{"type": "missing", "loc": ("body", file_field), "msg": "Field required", "input": None}]
+            )
+    except BaseException as exc:
+        form.discard()  # also on cancellation, so no await here
+        if isinstance(exc, HTTPException) and exc.status_code == 413:
+            metrics.inc("uploads.rejected_too_large")
+        raise
+
+    metrics.inc("uploads.bytes", form.size)
+    return [
+        ReceivedUpload(
+            fields=form.fields,
+            filename=part.filename,
+            content_type=part.content_type,
+            temp_path=part.file.name,
+            size=part.size,
+            sha256=part.sha256.hexdigest(),
+        )
+        for part in form.files
+    ]
+
+
+async def receive_upload(request: Request, directory: str, file_field: str = "file") -> ReceivedUpload:
+    """Stream a multipart/form-data body with one file part into a temp file in `directory`."""
+    [upload] = await _receive(request, directory, file_field, 1, settings.MAX_UPLOAD_SIZE)
+    return upload
+
+
+async def receive_uploads(request: Request, directory: str, file_field: str = "files") -> list[ReceivedUpload]:
+    """Stream a multipart/form-data body with up to `UPLOAD_BATCH_MAX_FILES` file parts into temp files.
+
+    Each file is held to `MAX_UPLOAD_SIZE`, all of them together to `MAX_BATCH_UPLOAD_SIZE`.
+    """
+    return await _receive(request, directory, file_field, settings.UPLOAD_BATCH_MAX_FILES, settings.MAX_BATCH_UPLOAD_SIZE)
@@ -3,6 +3,7 @@
 const API_BASE = window.location.hostname === 'localhost'
     ? 'http://localhost:8000'
     : 'https://taxexpert-api.onrender.com';  // ← UPDATE THIS after Render deploy
+const UPLOAD_BATCH_MAX_FILES = 20;  // keep in step with the backend's UPLOAD_BATCH_MAX_FILES
 
 // ─── Token Management ───
 function getToken() { return localStorage.getItem('taxexpert_token'); }
@@ -21,7 +22,7 @@ async function api(path, options = {}) {
     const token = getToken();
     const headers = { ...(options.headers || {}) };
     if (token) headers['Authorization'] = `Bearer ${token}`;
-    if (!(options.body instanceof FormData)) {
+    if (!(options.body instanceof FormData) && !headers['Content-Type']) {
         headers['Content-Type'] = 'application/json';
     }
     const res = await fetch(`${API_BASE}${path}`, { ...options, headers });
@@ -73,13 +74,32 @@ async function apiGetFiling(id) {
 async function apiUpdateFiling(id, data) {
     return api(`/api/filings/${id}`, { method: 'PUT', body: JSON.stringify(data) });
 }
+async function apiPatchFiling(id, patch, version) {
+    // JSON merge patch — only changed fields; fails (412) if the filing moved past `version`
+    const headers = { 'Content-Type': 'application/merge-patch+json' };
+    if (version) headers['If-Match'] = `"${version}"`;
+    return api(`/api/filings/${id}`, { method: 'PATCH', body: JSON.stringify(patch), headers });
+}
+// The comparison plus the filing's version after saving it (from the ETag, for the next If-Match)
 async function apiCalculateTax(id) {
-    return api(`/api/filings/${id}/calculate`, { method: 'POST' });
+    const res = await fetch(`${API_BASE}/api/filings/${id}/calculate`, {
+        method: 'POST',
+        headers: { 'Authorization': `Bearer ${getToken()}` },
+    });
+    if (res.status === 401) { logout(); throw new Error('Session expired'); }
+    const data = await res.json();
+    if (!res.ok) throw new Error(data.detail || 'Request failed');
+    return { result: data, version: parseInt((res.headers.get('ETag') || '').replace(/"/g, ''), 10) };
 }
 async function apiGetSuggestions(id) {
     return api(`/api/filings/${id}/suggestions`);
 }
 
+// ─── Tax API (stateless, nothing is saved) ───
+async function apiPreviewTax(data) {
+    return api('/api/tax/preview', { method: 'POST', body: JSON.stringify(data) });
+}
+
 // ─── User API ───
 async function apiGetProfile() {
     return api('/api/users/profile');
@@ -98,6 +118,22 @@ async function apiUploadDocument(file, docType) {
     formData.append('doc_type', docType);
     return api('/api/documents/', { method: 'POST', body: formData });
 }
+// The file as a Blob; the browser cache revalidates it with the ETag (304 on repeat previews)
+async function apiGetDocumentContent(id) {
+    const res = await fetch(`${API_BASE}/api/documents/${id}/content`, {
+        headers: { 'Authorization': `Bearer ${getToken()}` },
+    });
+    if (res.status === 401) { logout(); throw new Error('Session expired'); }
+    if (!res.ok) throw new Error((await res.json()).detail || 'Download failed');
+    return res.blob();
+}
+async function apiUploadDocuments(files, docType) {
+    if (files.length > UPLOAD_BATCH_MAX_FILES) throw new Error(`At most ${UPLOAD_BATCH_MAX_FILES} files per upload`);
+    const formData = new FormData();
+    for (const file of files) formData.append('files', file);
+    formData.append('doc_type', docType);
+    return api('/api/documents/batch', { method: 'POST', body: formData });
+}
 async function apiDeleteDocument(id) {
     return api(`/api/documents/${id}`, { method: 'DELETE' });
 }
@@ -97,8 +97,9 @@ async function handleRegister(e) {
 async function loadDashboardData() {
     try {
         const filings = await apiGetFilings();
-        // Find latest calculated filing
-        const latest = filings.find(f => f.tax_computation) || filings[0];
+        // Find latest calculated filing (the list has summaries only — fetch its details)
+        const summary = filings.find(f => ['calculated', 'submitted', 'filed'].includes(f.status)) || filings[0];
+        const latest = summary && await apiGetFiling(summary.id);
 
         if (latest) {
             const tc = latest.tax_computation;
@@ -130,21 +130,37 @@ function collectDeductionData() {
     return { section_80c: v('ded_80c'), section_80ccd_1b: v('ded_80ccd'), section_80d: v('ded_80d'), section_80g: v('ded_80g'), hra_exemption: v('ded_hra'), home_loan_interest: v('ded_homeloan'), education_loan_interest: v('ded_edu'), standard_deduction: 75000 };
 }
 
+// Merge-patch of the fields in `after` that differ from `before` (nested objects diffed member by member)
+function mergeDiff(before, after) {
+    const patch = {};
+    for (const [key, value] of Object.entries(after)) {
+        const old = before?.[key];
+        if (value && typeof value === 'object' && old && typeof old === 'object') {
+            const sub = mergeDiff(old, value);
+            if (Object.keys(sub).length) patch[key] = sub;
+        } else if (value !== old) {
+            patch[key] = value;
+        }
+    }
+    return patch;
+}
+
+// Save only what changed since the last save; the response becomes the new local copy
+async function saveFiling(changes) {
+    const patch = mergeDiff(wizardFiling, changes);
+    if (!Object.keys(patch).length) return;
+    wizardFiling = await apiPatchFiling(wizardFiling.id, patch, wizardFiling.version);
+}
+
 async function nextWizardStep() {
     try {
         if (wizardStep === 0) {
-            await apiUpdateFiling(wizardFiling.id, { personal_info: collectPersonalInfo(), status: 'in_progress' });
-            wizardFiling.personal_info = collectPersonalInfo();
+            await saveFiling({ personal_info: collectPersonalInfo(), status: 'in_progress' });
         } else if (wizardStep === 1) {
-            const inc = collectIncomeData();
-            await apiUpdateFiling(wizardFiling.id, { income_data: inc });
-            wizardFiling.income_data = inc;
+            await saveFiling({ income_data: collectIncomeData() });
         } else if (wizardStep === 2) {
-            const ded = collectDeductionData();
             const tds = parseFloat(document.getElementById('ded_tds')?.value) || 0;
-            await apiUpdateFiling(wizardFiling.id, { deduction_data: ded, tds_paid: tds });
-            wizardFiling.deduction_data = ded;
-            wizardFiling.tds_paid = tds;
+            await saveFiling({ deduction_data: collectDeductionData(), tds_paid: tds });
         }
         wizardStep++;
         renderWizardStep();
@@ -157,8 +173,8 @@ function prevWizardStep() { if (wizardStep > 0) { wizardStep--; renderWizardStep
 
 async function loadTaxCalculation() {
     try {
-        const result = await apiCalculateTax(wizardFiling.id);
-        wizardFiling.tax_computation = result;
+        const { result, version } = await apiCalculateTax(wizardFiling.id);
+        Object.assign(wizardFiling, { tax_computation: result, version });
         const area = document.getElementById('taxComparisonArea');
         if (!area) return;
         area.innerHTML = `
@@ -182,8 +198,7 @@ async function loadTaxCalculation() {
         <div style="text-align:center;margin-top:24px;padding:16px;background:rgba(16,185,129,0.08);border-radius:var(--radius-md);border:1px solid rgba(16,185,129,0.2)">
             <p style="font-size:1.1rem;font-weight:700;color:var(--accent-secondary-light)">💰 You save ${formatCurrency(result.savings)} with the ${result.recommended === 'old' ? 'Old' : 'New'} Regime</p>
         </div>`;
-        wizardFiling.regime = result.recommended;
-        await apiUpdateFiling(wizardFiling.id, { regime: result.recommended });
+        await saveFiling({ regime: result.recommended });
     } catch (e) {
         document.getElementById('taxComparisonArea').innerHTML = `<div class="empty-state"><p style="color:var(--accent-danger)">Error: ${e.message}</p></div>`;
     }
@@ -213,7 +228,7 @@ async function loadSuggestions() {
 
 async function submitFiling() {
     try {
-        await apiUpdateFiling(wizardFiling.id, { status: 'submitted' });
+        await saveFiling({ status: 'submitted' });
         showToast('Filing submitted successfully! 🎉', 'success');
         navigateTo('dashboard');
     } catch (e) { showToast('Error: ' + e.message, 'error'); }
@@ -250,7 +265,7 @@ async function loadDocuments() {
         if (!docs.length) { grid.innerHTML = '<div class="empty-state"><div class="empty-state-icon">📄</div><h3>No documents yet</h3><p>Upload your first document above.</p></div>'; return; }
         grid.innerHTML = docs.map(d => {
             const icons = { form16: '📋', bank_statement: '🏦', investment_proof: '📈', rent_receipt: '🏠', salary_slip: '💼', other: '📄' };
-            return `<div class="doc-card"><div class="doc-icon">${icons[d.doc_type] || '📄'}</div><div class="doc-info"><div class="doc-name">${d.filename}</div><div class="doc-meta">${d.doc_type.replace('_', ' ')} • ${d.file_size ? (d.file_size / 1024).toFixed(1) + 'KB' : ''} • ${formatDate(d.uploaded_at)}</div></div><div class="doc-actions"><button class="btn btn-ghost btn-sm" onclick="deleteDoc('${d.id}')" title="Delete">🗑️</button></div></div>`;
+            return `<div class="doc-card"><div class="doc-icon">${icons[d.doc_type] || '📄'}</div><div class="doc-info"><div class="doc-name">${d.filename}</div><div class="doc-meta">${d.doc_type.replace('_', ' ')} • ${d.file_size ? (d.file_size / 1024).toFixed(1) + 'KB' : ''} • ${formatDate(d.uploaded_at)}</div></div><div class="doc-actions"><button class="btn btn-ghost btn-sm" onclick="previewDoc('${d.id}')" title="Preview">👁️</button><button class="btn btn-ghost btn-sm" onclick="deleteDoc('${d.id}')" title="Delete">🗑️</button></div></div>`;
         }).join('');
     } catch (e) { showToast('Failed to load documents', 'error'); }
 }
@@ -258,8 +273,12 @@ async function loadDocuments() {
 async function handleFileUpload(event) {
     const files = event.target.files;
     const docType = document.getElementById('docTypeSelect')?.value || 'other';
-    for (const file of files) {
-        try { await apiUploadDocument(file, docType); showToast(`${file.name} uploaded!`, 'success'); } catch (e) { showToast(`Failed: ${file.name}`, 'error'); }
+    if (files.length > UPLOAD_BATCH_MAX_FILES) {
+        showToast(`Select at most ${UPLOAD_BATCH_MAX_FILES} files at a time`, 'error');
+    } else if (files.length > 1) {
+        try { const docs = await apiUploadDocuments(files, docType); showToast(`${docs.length} files uploaded!`, 'success'); } catch (e) { showToast(`Upload failed: ${e.message}`, 'error'); }
+    } else if (files.length) {
+        try { await apiUploadDocument(files[0], docType); showToast(`${files[0].name} uploaded!`, 'success'); } catch (e) { showToast(`Failed: ${files[0].name}`, 'error'); }
     }
     loadDocuments();
     event.target.value = '';
@@ -272,6 +291,15 @@ function handleDrop(event) {
     if (files.length) { document.getElementById('fileInput').files = files; handleFileUpload({ target: { files, value: '' } }); }
 }
 
+async function previewDoc(id) {
+    const tab = window.open('', '_blank');
+    try {
+        const url = URL.createObjectURL(await apiGetDocumentContent(id));
+        tab.location = url;
+        setTimeout(() => URL.revokeObjectURL(url), 60000);
+    } catch (e) { tab?.close(); showToast('Failed to open document', 'error'); }
+}
+
 async function deleteDoc(id) {
     try { await apiDeleteDocument(id); showToast('Document deleted', 'info'); loadDocuments(); } catch (e) { showToast('Failed to delete', 'error'); }
 }
@@ -0,0 +1,36 @@
+"""Shared fixtures: the app on a throwaway SQLite database and upload directory."""
+
+import os
+import tempfile
+
+# Settings are read when backend.config is first imported, so point them at a
+# temporary directory before any test module imports the app.
+_TMP = tempfile.mkdtemp(prefix="taxexpert-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite+aiosqlite:///{_TMP}/test.db",
+    UPLOAD_DIR=f"{_TMP}/uploads",
+    DEBUG="false",
+)
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from backend.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def auth(client) -> dict:
+    """A registered user: {"headers": ..., "user_id": ...}."""
+    response = client.post(
+        "/api/auth/register",
+        json={"email": "reader@example.com", "password": "secret-pass", "full_name": "Reader"},
+    )
+    assert response.status_code == 201, response.text
+    body = response.json()
+    return {"headers": {"Authorization": f"Bearer {body['access_token']}"}, "user_id": body["user"]["id"]}
@@ -0,0 +1,71 @@
+"""The vectorized engine must agree with the scalar engine to the paisa."""
+
+import random
+
+import numpy as np
+import pytest
+
+from backend.schemas.filing import DeductionData, IncomeData
+from backend.services.batch_engine import DEDUCTION_DEFAULTS, INCOME_FIELDS, compare_regimes_batch
+from backend.services.tax_engine import compare_regimes
+from backend.services.tax_rules import SUPPORTED_FINANCIAL_YEARS
+
+REGIME_FIELDS = (
+    "gross_total_income", "total_deductions", "taxable_income", "tax_on_income",
+    "surcharge", "cess", "total_tax", "tds_paid", "refund_or_due",
+)
+
+
+def _population(seed: int, size: int = 2000) -> tuple[list[dict], list[dict], list[float]]:
+    rng = random.Random(seed)
+    incomes, deductions, tds = [], [], []
+    for _ in range(size):
+        incomes.append({
+            "salary": round(rng.uniform(0, 6_000_000), rng.choice((0, 1, 2))),
+            "house_property": rng.choice((0, round(rng.uniform(-200_000, 400_000), 2))),
+            "capital_gains_short": rng.choice((0, 0, round(rng.uniform(0, 1_000_000), 2))),
+            "capital_gains_long": 0,
+            "business_income": rng.choice((0, 0, round(rng.uniform(0, 60_000_000), 2))),
+            "other_income": round(rng.uniform(0, 100_000), 2),
+        })
+        deductions.append({
+            "section_80c": round(rng.uniform(0, 200_000), 2),
+            "section_80ccd_1b": rng.choice((0, 50_000)),
+            "section_80d": round(rng.uniform(0, 50_000), 2),
+            "section_80g": 0,
+            "hra_exemption": rng.choice((0, round(rng.uniform(0, 300_000), 2))),
+            "home_loan_interest": rng.choice((0, round(rng.uniform(0, 300_000), 2))),
+            "education_loan_interest": 0,
+            "standard_deduction": 75000,
+        })
+        tds.append(round(rng.uniform(0, 500_000), 2))
+    # Incomes whose raw tax lands on a half paisa (e.g. 60000.075).
+    incomes[0]["salary"] = 1275000.5
+    incomes[1]["salary"] = 1275000.25
+    return incomes, deductions, tds
+
+
+@pytest.mark.parametrize("financial_year", SUPPORTED_FINANCIAL_YEARS)
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_matches_scalar(financial_year, seed):
+    incomes, deductions, tds = _population(seed)
+    batch = compare_regimes_batch(
+        {field: [row[field] for row in incomes] for field in INCOME_FIELDS},
+        {field: [row[field] for row in deductions] for field in DEDUCTION_DEFAULTS},
+        tds,
+        financial_year,
+    )
+    for i, (income, deduction, tds_paid) in enumerate(zip(incomes, deductions, tds)):
+        scalar = compare_regimes(IncomeData(**income), DeductionData(**deduction), tds_paid, financial_year)
+        for regime in ("old_regime", "new_regime"):
+            expected, actual = getattr(scalar, regime), getattr(batch, regime)
+            for field in REGIME_FIELDS:
+                assert float(getattr(actual, field)[i]) == getattr(expected, field), (i, regime, field)
+        assert batch.recommended[i] == scalar.recommended, i
+        assert float(batch.savings[i]) == scalar.savings, i
+
+
+def test_half_paisa_rounds_like_scalar():
+    batch = compare_regimes_batch({"salary": np.array([1275000.5])}, {})
+    scalar = compare_regimes(IncomeData(salary=1275000.5), DeductionData())
+    assert float(batch.new_regime.tax_on_income[0]) == scalar.new_regime.tax_on_income == 60000.07
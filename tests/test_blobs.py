@@ -0,0 +1,149 @@
+"""Shared document content: reference counting, deletes after commit, batch uploads and temp-file cleanup."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from sqlalchemy import func, select
+
+from backend.database import async_session
+from backend.models.blob import Blob
+from backend.models.document import Document
+from backend.services import blobs
+
+
+def _upload(client, auth, content: bytes) -> dict:
+    response = client.post(
+        "/api/documents/", headers=auth["headers"],
+        files={"file": ("statement.txt", content, "text/plain")}, data={"doc_type": "other"},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _blob_row(client, sha256: str) -> Blob | None:
+    async def load():
+        async with async_session() as db:
+            return (await db.execute(select(Blob).where(Blob.sha256 == sha256))).scalar_one_or_none()
+    return client.portal.call(load)
+
+
+def test_file_goes_with_last_reference(client, auth):
+    first = _upload(client, auth, b"shared bytes")
+    second = _upload(client, auth, b"shared bytes")
+    path = blobs.blob_path(first["sha256"])
+    assert second["sha256"] == first["sha256"] and os.path.exists(path)
+
+    assert client.delete(f"/api/documents/{first['id']}", headers=auth["headers"]).status_code == 204
+    assert os.path.exists(path)
+    assert _blob_row(client, first["sha256"]).refcount == 1
+
+    assert client.delete(f"/api/documents/{second['id']}", headers=auth["headers"]).status_code == 204
+    assert not os.path.exists(path)
+    assert _blob_row(client, first["sha256"]) is None
+
+    again = _upload(client, auth, b"shared bytes")
+    assert os.path.exists(path)
+    assert client.get(f"/api/documents/{again['id']}/content", headers=auth["headers"]).content == b"shared bytes"
+
+
+def test_release_keeps_file_until_commit(client, auth):
+    doc = _upload(client, auth, b"rolled back")
+    path = blobs.blob_path(doc["sha256"])
+
+    async def release_and_roll_back():
+        async with async_session() as db:
+            orphan = await blobs.release(db, doc["sha256"], path)
+            assert orphan == path and os.path.exists(path)
+            await db.rollback()
+
+    client.portal.call(release_and_roll_back)
+    assert os.path.exists(path)
+    assert _blob_row(client, doc["sha256"]).refcount == 1
+
+
+def test_purge_spares_content_uploaded_again(client, auth):
+    doc = _upload(client, auth, b"uploaded again")
+    path = blobs.blob_path(doc["sha256"])
+
+    async def release_then_reupload():
+        async with async_session() as db:
+            orphan = await blobs.release(db, doc["sha256"], path)
+            await db.commit()
+        return orphan
+
+    orphan = client.portal.call(release_then_reupload)
+    again = _upload(client, auth, b"uploaded again")  # lands between commit and purge
+    client.portal.call(blobs.purge, doc["sha256"], orphan)
+    assert os.path.exists(path)
+    assert _blob_row(client, again["sha256"]).refcount == 1
+
+
+def _temp_files() -> list[str]:
+    return os.listdir(blobs.UPLOAD_TEMP_DIR) if os.path.isdir(blobs.UPLOAD_TEMP_DIR) else []
+
+
+@pytest.mark.parametrize("error", [RuntimeError("database down"), asyncio.CancelledError()])
+def test_failed_reference_discards_temp_files(client, auth, monkeypatch, error):
+    async def fail(db, uploads):
+        raise error
+
+    monkeypatch.setattr(blobs, "_add_references", fail)
+    before = _temp_files()
+    with pytest.raises(BaseException):
+        client.post(
+            "/api/documents/", headers=auth["headers"],
+            files={"file": ("a.txt", b"never stored", "text/plain")}, data={"doc_type": "other"},
+        )
+    with pytest.raises(BaseException):
+        client.post(
+            "/api/documents/batch", headers=auth["headers"],
+            files=[("files", ("b.txt", b"batch one", "text/plain")), ("files", ("c.txt", b"batch two", "text/plain"))],
+            data={"doc_type": "other"},
+        )
+    assert _temp_files() == before
+
+
+def _upload_batch(client, auth, *contents: bytes):
+    return client.post(
+        "/api/documents/batch", headers=auth["headers"],
+        files=[("files", (f"{i}.txt", content, "text/plain")) for i, content in enumerate(contents)],
+        data={"doc_type": "other"},
+    )
+
+
+def _document_count(client, auth) -> int:
+    async def count():
+        async with async_session() as db:
+            return await db.scalar(select(func.count()).select_from(Document).where(Document.user_id == auth["user_id"]))
+    return client.portal.call(count)
+
+
+def test_batch_shares_content(client, auth):
+    temp_before = _temp_files()
+    response = _upload_batch(client, auth, b"batch twin", b"batch single", b"batch twin")
+    assert response.status_code == 201, response.text
+    docs = response.json()
+    assert [doc["filename"] for doc in docs] == ["0.txt", "1.txt", "2.txt"]
+    assert docs[0]["sha256"] == docs[2]["sha256"] != docs[1]["sha256"]
+    assert _blob_row(client, docs[0]["sha256"]).refcount == 2
+    assert _blob_row(client, docs[1]["sha256"]).refcount == 1
+    assert _temp_files() == temp_before  # the duplicate's temp file is discarded too
+
+    single = _upload(client, auth, b"batch twin")  # a later single upload joins the batch's blob
+    assert _blob_row(client, single["sha256"]).refcount == 3
+    for doc in (docs[0], single):
+        assert client.delete(f"/api/documents/{doc['id']}", headers=auth["headers"]).status_code == 204
+    assert _blob_row(client, single["sha256"]).refcount == 1
+    assert client.get(f"/api/documents/{docs[2]['id']}/content", headers=auth["headers"]).content == b"batch twin"
+
+
+def test_batch_over_file_limit_stores_nothing(client, auth, monkeypatch):
+    monkeypatch.setattr(blobs.settings, "UPLOAD_BATCH_MAX_FILES", 3)
+    before, temp_before = _document_count(client, auth), _temp_files()
+    response = _upload_batch(client, auth, b"one", b"two", b"three", b"four")
+    assert response.status_code == 400
+    assert _document_count(client, auth) == before
+    assert _temp_files() == temp_before
+    assert _blob_row(client, hashlib.sha256(b"four").hexdigest()) is None
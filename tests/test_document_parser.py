@@ -0,0 +1,117 @@
+"""Form 16 / salary slip figures, and how the background parser treats failures."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+
+from backend.database import async_session
+from backend.models.document import Document
+from backend.services import parsing
+from backend.services.document_parser import parse_document
+
+FORM16 = """\
+FORM NO. 16
+PAN of the Employee ABCDE1234F  TAN of the Deductor MUMA12345B
+Gross Salary 18,50,000.00
+Standard deduction under section 16(ia) 75,000
+Deduction under section 80C 1,50,000
+{tds_line}
+"""
+
+
+@pytest.mark.parametrize("tds_line", [
+    "Total amount of tax deducted 2,10,400",
+    "Tax Deducted at Source 2,10,400",
+    "TDS 2,10,400",
+    "Less: TDS (as per Part A) 2,10,400.00",
+])
+def test_form16_tds_labels(tmp_path, tds_line):
+    path = tmp_path / "form16.txt"
+    path.write_text(FORM16.format(tds_line=tds_line))
+    parsed, _ = parse_document(str(path), "text/plain", "form16.txt", "form16")
+    assert parsed["tds_paid"] == 210400
+    assert parsed["income_data"] == {"salary": 1850000}
+    assert parsed["deduction_data"] == {"section_80c": 150000, "standard_deduction": 75000}
+    assert parsed["personal_info"] == {"pan": "ABCDE1234F", "employer_tan": "MUMA12345B"}
+
+
+def test_form16_tds_is_not_net_tax_payable(tmp_path):
+    """The final liability printed above the TDS line must not be taken for tax deducted."""
+    path = tmp_path / "form16.txt"
+    path.write_text(FORM16.format(tds_line="Net tax payable 2,45,000\nTax deducted at source 2,10,400"))
+    parsed, _ = parse_document(str(path), "text/plain", "form16.txt", "form16")
+    assert parsed["tds_paid"] == 210400
+
+
+def test_form16_without_tds_line(tmp_path):
+    path = tmp_path / "form16.txt"
+    path.write_text(FORM16.format(tds_line="Net tax payable 2,45,000"))
+    parsed, _ = parse_document(str(path), "text/plain", "form16.txt", "form16")
+    assert parsed["tds_paid"] is None
+
+
+def test_missing_file_fails_without_retry(client, auth, tmp_path, monkeypatch):
+    monkeypatch.setattr(parsing, "_get_pool", lambda: ThreadPoolExecutor(1))
+
+    async def run() -> tuple[bool, dict]:
+        async with async_session() as db:
+            doc = Document(
+                user_id=auth["user_id"], doc_type="form16", filename="form16.txt",
+                file_path=str(tmp_path / "gone.txt"), file_size=10, mime_type="text/plain",
+            )
+            db.add(doc)
+            await db.commit()
+        retried = await parsing._process(doc.id, 1)
+        async with async_session() as db:
+            stored = (await db.execute(select(Document.parsed_data).where(Document.id == doc.id))).scalar_one()
+        return retried, stored
+
+    retried, stored = client.portal.call(run)
+    assert retried is False
+    assert stored["status"] == "failed"
+    assert stored["error"] == "Document file is missing"
+
+
+def _hang(*args):
+    """Stands in for parse_document on a PDF that never finishes (runs in a pool worker)."""
+    time.sleep(300)
+
+
+def test_timeout_kills_hung_worker(client, auth, tmp_path, monkeypatch):
+    path = tmp_path / "form16.txt"
+    path.write_text("TDS 1,000")
+    workers = []
+
+    def reset_pool():
+        workers.extend(parsing._pool._processes.values())  # the hung worker, before the reset
+        original_reset_pool()
+
+    original_reset_pool = parsing._reset_pool
+    monkeypatch.setattr(parsing, "_reset_pool", reset_pool)
+    monkeypatch.setattr(parsing, "parse_document", _hang)
+    monkeypatch.setattr(parsing.settings, "PARSE_TIMEOUT", 3)
+
+    async def run() -> tuple[bool, dict]:
+        async with async_session() as db:
+            doc = Document(
+                user_id=auth["user_id"], doc_type="form16", filename="form16.txt",
+                file_path=str(path), file_size=9, mime_type="text/plain",
+            )
+            db.add(doc)
+            await db.commit()
+        retried = await parsing._process(doc.id, parsing.settings.PARSE_MAX_ATTEMPTS)
+        async with async_session() as db:
+            stored = (await db.execute(select(Document.parsed_data).where(Document.id == doc.id))).scalar_one()
+        return retried, stored
+
+    retried, stored = client.portal.call(run)
+    assert retried is False and stored["status"] == "failed"
+    assert parsing._pool is None
+
+    assert workers
+    deadline = time.monotonic() + 5
+    while any(worker.is_alive() for worker in workers) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(worker.is_alive() for worker in workers)
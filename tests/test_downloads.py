@@ -0,0 +1,102 @@
+"""Document downloads: byte ranges, If-Range and conditional requests."""
+
+import os
+
+import pytest
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture(scope="module")
+def document(client, auth) -> dict:
+    response = client.post(
+        "/api/documents/", headers=auth["headers"],
+        files={"file": ("scan.pdf", CONTENT, "application/pdf")}, data={"doc_type": "other"},
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def _get(client, auth, document, **headers):
+    return client.get(f"/api/documents/{document['id']}/content", headers={**auth["headers"], **headers})
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_whole_file(client, auth, document):
+    response = _get(client, auth, document)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{document["sha256"]}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["content-disposition"] == 'inline; filename="scan.pdf"'
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=100-199", 100, 199),
+    ("bytes=10000-", 10000, 10239),
+    ("bytes=10000-99999", 10000, 10239),  # clamped to the file
+    ("bytes=-240", 10000, 10239),  # suffix
+    ("bytes=-99999", 0, 10239),  # suffix longer than the file
+])
+def test_single_range(client, auth, document, range_header, start, end):
+    response = _get(client, auth, document, Range=range_header)
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+    assert response.headers["content-length"] == str(end - start + 1)
+
+
+@pytest.mark.parametrize("range_header", ["bytes=10240-", "bytes=20000-30000", "bytes=-0"])
+def test_unsatisfiable_range(client, auth, document, range_header):
+    before = _open_fds()
+    response = _get(client, auth, document, Range=range_header)
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert _open_fds() == before  # the file opened for the size is closed again
+
+
+@pytest.mark.parametrize("range_header", ["bytes=0-10,20-30", "items=0-10", "bytes=50-10", "bytes=-"])
+def test_other_ranges_get_whole_file(client, auth, document, range_header):
+    response = _get(client, auth, document, Range=range_header)
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_if_range(client, auth, document):
+    etag = f'"{document["sha256"]}"'
+    last_modified = _get(client, auth, document).headers["last-modified"]
+
+    for current in (etag, last_modified):
+        response = _get(client, auth, document, Range="bytes=0-9", **{"If-Range": current})
+        assert response.status_code == 206 and response.content == CONTENT[:10]
+
+    for stale in ('"0000"', f"W/{etag}", "Mon, 01 Jan 2001 00:00:00 GMT"):
+        response = _get(client, auth, document, Range="bytes=0-9", **{"If-Range": stale})
+        assert response.status_code == 200 and response.content == CONTENT
+
+
+def test_if_none_match(client, auth, document):
+    etag = f'"{document["sha256"]}"'
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = _get(client, auth, document, **{"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    response = _get(client, auth, document, **{"If-None-Match": '"other"'})
+    assert response.status_code == 200 and response.content == CONTENT
+
+    # If-None-Match takes precedence over a matching If-Modified-Since
+    last_modified = response.headers["last-modified"]
+    response = _get(client, auth, document, **{"If-None-Match": '"other"', "If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_if_modified_since(client, auth, document):
+    last_modified = _get(client, auth, document).headers["last-modified"]
+    assert _get(client, auth, document, **{"If-Modified-Since": last_modified}).status_code == 304
+    assert _get(client, auth, document, **{"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"}).status_code == 200
+    assert _get(client, auth, document, **{"If-Modified-Since": "not a date"}).status_code == 200
@@ -0,0 +1,59 @@
+"""Filing versions (ETags) and the shape PUT / PATCH store blobs in."""
+
+from backend.schemas.filing import IncomeData
+
+MERGE_PATCH = {"Content-Type": "application/merge-patch+json"}
+
+
+def _new_filing(client, auth) -> dict:
+    response = client.post("/api/filings/", headers=auth["headers"], json={})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_calculate_bumps_version(client, auth):
+    filing = _new_filing(client, auth)
+    saved = client.patch(
+        f"/api/filings/{filing['id']}", headers={**auth["headers"], **MERGE_PATCH},
+        json={"income_data": {"salary": 1500000}},
+    )
+    etag = saved.headers["ETag"]
+
+    calculated = client.post(f"/api/filings/{filing['id']}/calculate", headers=auth["headers"])
+    assert calculated.status_code == 200, calculated.text
+    assert calculated.headers["ETag"] != etag
+    assert client.get(f"/api/filings/{filing['id']}", headers=auth["headers"]).headers["ETag"] == calculated.headers["ETag"]
+
+    # The pre-calculation ETag is stale; the one calculate returned is current
+    stale = client.patch(
+        f"/api/filings/{filing['id']}", headers={**auth["headers"], **MERGE_PATCH, "If-Match": etag},
+        json={"regime": "old"},
+    )
+    assert stale.status_code == 412
+    fresh = client.patch(
+        f"/api/filings/{filing['id']}",
+        headers={**auth["headers"], **MERGE_PATCH, "If-Match": calculated.headers["ETag"]},
+        json={"regime": "old"},
+    )
+    assert fresh.status_code == 200, fresh.text
+
+    # Unchanged inputs are served from the stored result without a new version
+    again = client.post(f"/api/filings/{filing['id']}/calculate", headers=auth["headers"])
+    assert again.headers["ETag"] != calculated.headers["ETag"]  # the regime changed
+    repeat = client.post(f"/api/filings/{filing['id']}/calculate", headers=auth["headers"])
+    assert repeat.headers["ETag"] == again.headers["ETag"]
+
+
+def test_put_and_patch_store_the_same_blob(client, auth):
+    income = {"salary": 900000, "unknown_member": 1}
+    put = _new_filing(client, auth)
+    patched = _new_filing(client, auth)
+
+    client.put(f"/api/filings/{put['id']}", headers=auth["headers"], json={"income_data": income})
+    client.patch(f"/api/filings/{patched['id']}", headers={**auth["headers"], **MERGE_PATCH}, json={"income_data": income})
+
+    stored = [
+        client.get(f"/api/filings/{filing['id']}", headers=auth["headers"]).json()["income_data"]
+        for filing in (put, patched)
+    ]
+    assert stored[0] == stored[1] == IncomeData(salary=900000).model_dump()
@@ -0,0 +1,118 @@
+"""Optimizer and suggestions: every saving reported must match a direct compare_regimes run."""
+
+import pytest
+
+from backend.schemas.filing import DeductionData, IncomeData
+from backend.services.optimizer import generate_optimization_suggestions, optimize_deductions
+from backend.services.tax_engine import compare_regimes
+from backend.services.tax_rules import get_rules
+
+SECTION_CATEGORIES = {
+    "Section 80C": "section_80c",
+    "Section 80CCD(1B)": "section_80ccd_1b",
+    "Section 80D": "section_80d",
+}
+
+CASES = {
+    # Old regime wins once the investment sections are filled
+    "old-optimal": (IncomeData(salary=2400000), DeductionData(hra_exemption=500000, home_loan_interest=200000, section_80c=50000)),
+    # Old regime wins, but taxable income sits just above a slab breakpoint and 80D alone does not beat the new regime
+    "old-after-plan": (IncomeData(salary=1600000), DeductionData(hra_exemption=300000, home_loan_interest=200000)),
+    # New regime (87A rebate) wins whatever is invested
+    "new-optimal": (IncomeData(salary=1100000), DeductionData()),
+    # No tax in either regime — nothing can save anything
+    "no-tax": (IncomeData(salary=520000), DeductionData()),
+}
+
+
+def _best_tax(income: IncomeData, deductions: DeductionData, **extra: float) -> float:
+    filled = deductions.model_copy(update={field: getattr(deductions, field) + value for field, value in extra.items()})
+    comparison = compare_regimes(income, filled)
+    return min(comparison.old_regime.total_tax, comparison.new_regime.total_tax)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_plan_matches_engine(case):
+    income, deductions = CASES[case]
+    plan = optimize_deductions(income, deductions)
+    current = compare_regimes(income, deductions)
+    assert plan["current_tax"] == {"old": current.old_regime.total_tax, "new": current.new_regime.total_tax}
+
+    optimized = compare_regimes(income, deductions.model_copy(update={
+        field: getattr(deductions, field) + value for field, value in plan["allocation"].items()
+    }))
+    assert plan["optimized_tax"]["old"] == optimized.old_regime.total_tax
+    assert plan["savings"] == round(_best_tax(income, deductions) - _best_tax(income, deductions, **plan["allocation"]), 2)
+    assert sum(plan["allocation"].values()) == plan["invest"]
+
+    # No allocation on a ₹1,000 grid reaches a lower tax, and none reaching the same tax is cheaper
+    rules = get_rules()
+    room = {"section_80c": rules.cap_80c - deductions.section_80c,
+            "section_80ccd_1b": rules.cap_80ccd_1b - deductions.section_80ccd_1b,
+            "section_80d": rules.cap_80d - deductions.section_80d}
+    optimized_best = min(plan["optimized_tax"].values())
+    for amount in range(0, int(sum(room.values())) + 1, 1000):
+        extra, left = {}, amount
+        for field, cap in room.items():
+            extra[field] = min(cap, left)
+            left -= extra[field]
+        tax = _best_tax(income, deductions, **extra)
+        assert tax >= optimized_best
+        if plan["recommended_regime"] == "old" and tax == optimized_best:
+            assert amount >= plan["invest"] - 1000
+
+
+def test_new_regime_plan_invests_nothing():
+    plan = optimize_deductions(*CASES["new-optimal"])
+    assert plan["recommended_regime"] == "new"
+    assert plan["invest"] == 0 and plan["savings"] == 0
+
+
+def test_budget_caps_plan():
+    income, deductions = CASES["old-optimal"]
+    plan = optimize_deductions(income, deductions, budget=60000)
+    assert plan["invest"] <= 60000
+    assert plan["savings"] == round(_best_tax(income, deductions) - _best_tax(income, deductions, **plan["allocation"]), 2)
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_suggestion_savings_match_engine(case):
+    income, deductions = CASES[case]
+    rules = get_rules()
+    suggestions = {s["category"]: s for s in generate_optimization_suggestions(income, deductions)}
+
+    for category, field in SECTION_CATEGORIES.items():
+        room = getattr(rules, "cap_" + field.removeprefix("section_")) - getattr(deductions, field)
+        saving = round(_best_tax(income, deductions) - _best_tax(income, deductions, **{field: room}), 2)
+        if saving > 0:
+            assert suggestions[category]["potential_saving"] == saving
+        else:
+            assert category not in suggestions  # a top-up that saves nothing is not suggested
+
+
+def test_top_up_that_saves_nothing_is_omitted():
+    # 80D alone leaves the old regime above the new one, so it saves nothing
+    suggestions = {s["category"] for s in generate_optimization_suggestions(*CASES["old-after-plan"])}
+    assert "Section 80D" not in suggestions
+    assert "Section 80C" in suggestions
+
+    # Under the new regime's rebate no section helps
+    suggestions = {s["category"] for s in generate_optimization_suggestions(*CASES["new-optimal"])}
+    assert not suggestions & set(SECTION_CATEGORIES)
+
+    assert [s["category"] for s in generate_optimization_suggestions(*CASES["no-tax"])] == ["Optimized"]
+
+
+def test_optimize_and_suggestions_routes(client, auth):
+    income, deductions = CASES["old-optimal"]
+    filing = client.post("/api/filings/", headers=auth["headers"], json={}).json()
+    client.put(f"/api/filings/{filing['id']}", headers=auth["headers"],
+               json={"income_data": income.model_dump(), "deduction_data": deductions.model_dump()})
+
+    plan = client.get(f"/api/filings/{filing['id']}/optimize", headers=auth["headers"], params={"budget": 100000})
+    assert plan.status_code == 200
+    assert plan.json() == optimize_deductions(income, deductions, budget=100000)
+
+    suggestions = client.get(f"/api/filings/{filing['id']}/suggestions", headers=auth["headers"])
+    assert suggestions.status_code == 200
+    assert suggestions.json() == generate_optimization_suggestions(income, deductions)
@@ -0,0 +1,91 @@
+"""GET routes on the read session cost fewer round trips than the same routes on get_db."""
+
+from collections import Counter
+
+import pytest
+from sqlalchemy import event
+
+from backend.database import engine, get_db, get_read_db
+from backend.main import app
+from backend.utils.security import invalidate_user
+
+
+@pytest.fixture
+def trips(monkeypatch) -> Counter:
+    """Counts statements, DBAPI commits/rollbacks and open pooled connections."""
+    counts = Counter()
+    sync_engine = engine.sync_engine
+
+    def statement(*args):
+        counts["statements"] += 1
+
+    def checkout(*args):
+        counts["open"] += 1
+        counts["max_open"] = max(counts["max_open"], counts["open"])
+
+    def checkin(*args):
+        counts["open"] -= 1
+
+    def counted(name, method):
+        def wrapper(dbapi_connection):
+            counts[name] += 1
+            return method(dbapi_connection)
+        return wrapper
+
+    dialect = sync_engine.dialect
+    monkeypatch.setattr(dialect, "do_commit", counted("commits", dialect.do_commit))
+    monkeypatch.setattr(dialect, "do_rollback", counted("rollbacks", dialect.do_rollback))
+    listeners = [
+        (sync_engine, "before_cursor_execute", statement),
+        (sync_engine.pool, "checkout", checkout),
+        (sync_engine.pool, "checkin", checkin),
+    ]
+    for target, name, fn in listeners:
+        event.listen(target, name, fn)
+    yield counts
+    for target, name, fn in listeners:
+        event.remove(target, name, fn)
+
+
+@pytest.fixture
+def filing_id(client, auth) -> str:
+    response = client.post("/api/filings/", headers=auth["headers"], json={})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def _measure(client, auth, trips, path: str, cold_user: bool) -> Counter:
+    client.get(path, headers=auth["headers"])  # warm the token and user caches
+    if cold_user:
+        invalidate_user(auth["user_id"])
+    trips.clear()
+    response = client.get(path, headers=auth["headers"])
+    assert response.status_code == 200, response.text
+    return Counter(trips)
+
+
+@pytest.mark.parametrize("cold_user", [False, True], ids=["cached-user", "cold-user"])
+@pytest.mark.parametrize("path", ["/api/filings/{filing_id}", "/api/documents/"])
+def test_read_routes_skip_commit(client, auth, trips, filing_id, path, cold_user):
+    path = path.format(filing_id=filing_id)
+    read = _measure(client, auth, trips, path, cold_user)
+    app.dependency_overrides[get_read_db] = get_db
+    try:
+        write = _measure(client, auth, trips, path, cold_user)
+    finally:
+        app.dependency_overrides.pop(get_read_db)
+
+    assert read["commits"] == 0
+    assert read["commits"] < write["commits"]
+    assert read["statements"] <= write["statements"]
+    assert read["max_open"] == 1
+
+
+def test_current_user_releases_read_connection(client, auth, trips, filing_id):
+    """A write route resolving an uncached user holds one pooled connection at a time."""
+    invalidate_user(auth["user_id"])
+    trips.clear()
+    response = client.put(f"/api/filings/{filing_id}", headers=auth["headers"], json={"income_data": {"salary": 900000}})
+    assert response.status_code == 200, response.text
+    assert trips["statements"] >= 2  # the user row, then the filing write
+    assert trips["max_open"] == 1
@@ -0,0 +1,77 @@
+"""Stat counters: reconcile repairs drift without losing concurrent bumps."""
+
+import asyncio
+import uuid
+
+from sqlalchemy import func, select, update
+
+from backend.database import async_session
+from backend.models.stat_counter import StatCounter
+from backend.models.user import User
+from backend.services import stats
+
+
+async def _counters() -> dict[str, int]:
+    async with async_session() as db:
+        return dict((await db.execute(select(StatCounter.name, StatCounter.value))).all())
+
+
+async def _user_count() -> int:
+    async with async_session() as db:
+        return await db.scalar(select(func.count()).select_from(User))
+
+
+async def _add_user():
+    async with async_session() as db:
+        db.add(User(email=f"{uuid.uuid4().hex}@example.com", password_hash="x", full_name="Counted"))
+        await stats.bump(db, {"users": 1})
+        await db.commit()
+
+
+def test_reconcile_repairs_drift(client, auth):
+    async def run():
+        async with async_session() as db:
+            await db.execute(update(StatCounter).where(StatCounter.name == "users").values(value=999))
+            await stats.bump(db, {"filings.status.nonexistent": 3})
+            await db.commit()
+        async with async_session() as db:
+            await stats.reconcile(db)
+            await db.commit()
+        return await _counters(), await _user_count()
+
+    counters, users = client.portal.call(run)
+    assert counters["users"] == users
+    assert counters["filings.status.nonexistent"] == 0
+
+
+def test_bump_during_reconcile_is_kept(client, auth):
+    async def run():
+        counting, resume = asyncio.Event(), asyncio.Event()
+
+        async def reconcile():
+            async with async_session() as db:
+                scalar = db.scalar
+
+                async def paused_scalar(*args, **kwargs):
+                    result = await scalar(*args, **kwargs)
+                    if not counting.is_set():  # after the first count
+                        counting.set()
+                        await resume.wait()
+                    return result
+
+                db.scalar = paused_scalar
+                await stats.reconcile(db)
+                await db.commit()
+
+        reconciling = asyncio.create_task(reconcile())
+        await counting.wait()
+        adding = asyncio.create_task(_add_user())
+        await asyncio.sleep(0.3)
+        waited = not adding.done()  # held off by the counter lock
+        resume.set()
+        await asyncio.gather(reconciling, adding)
+        return waited, await _counters(), await _user_count()
+
+    waited, counters, users = client.portal.call(run)
+    assert waited
+    assert counters["users"] == users
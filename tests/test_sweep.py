@@ -0,0 +1,93 @@
+"""What-if sweeps: break-even detection and the /api/tax/sweep endpoint."""
+
+import numpy as np
+import pytest
+
+from backend.config import settings
+from backend.schemas.filing import DeductionData, IncomeData
+from backend.services.sweep import _break_even
+from backend.services.tax_engine import compare_regimes
+
+X = np.arange(6, dtype=np.float64) * 10
+
+
+def _crossings(*diff: float) -> list[float]:
+    return _break_even(X[: len(diff)], np.array(diff, dtype=np.float64)[:, None])[0]
+
+
+@pytest.mark.parametrize("diff, expected", [
+    ((5, 4, 3, 2, 1, 1), []),  # no crossing
+    ((-1, -2, 0.5, 0.5, 0, 0), [18.0]),  # trailing ties have no far side
+    ((1, -3), [2.5]),  # interpolated inside the interval
+    ((2, 0, -1), [10.0]),  # exactly on a grid point
+    ((2, 0, 0, -1), [10.0]),  # onto a run of ties, reported where it starts
+    ((2, 0, 1), []),  # curves touch without crossing
+    ((0, 0, 1, -1), [25.0]),  # leading ties are skipped
+    ((1, -1, 1, 0, -1, 1), [5.0, 15.0, 30.0, 45.0]),  # several crossings
+])
+def test_break_even(diff, expected):
+    assert _crossings(*diff) == expected
+
+
+def test_break_even_per_column():
+    diff = np.array([[1, -1, 0], [-1, -1, 0], [1, -1, 0]], dtype=np.float64)
+    assert _break_even(X[:3], diff) == [[5.0, 15.0], [], []]
+
+
+def _sweep(client, auth, **request):
+    return client.post("/api/tax/sweep", headers=auth["headers"], json=request)
+
+
+DEDUCTIONS = {"hra_exemption": 300000, "home_loan_interest": 200000, "section_80c": 150000, "section_80d": 25000}
+
+
+def _old_minus_new(salary: float) -> float:
+    comparison = compare_regimes(IncomeData(salary=salary), DeductionData(**DEDUCTIONS))
+    return comparison.old_regime.total_tax - comparison.new_regime.total_tax
+
+
+def test_sweep_endpoint_matches_engine(client, auth):
+    response = _sweep(client, auth, deduction_data=DEDUCTIONS,
+                      axes=[{"field": "salary", "start": 0, "stop": 5000000, "points": 501}])
+    assert response.status_code == 200
+    body = response.json()
+    salaries = body["axes"][0]["values"]
+    assert len(salaries) == len(body["old_regime"]) == len(body["new_regime"]) == 501
+    for i in (0, 120, 127, 128, 300, 500):
+        comparison = compare_regimes(IncomeData(salary=salaries[i]), DeductionData(**DEDUCTIONS))
+        assert body["old_regime"][i] == comparison.old_regime.total_tax
+        assert body["new_regime"][i] == comparison.new_regime.total_tax
+
+    # Old regime wins past the 87A rebate cliff, then loses again at higher incomes
+    assert len(body["break_even"]) == 2
+    for point in body["break_even"]:
+        lo, hi = salaries[int(point // 10000)], salaries[int(point // 10000) + 1]
+        assert np.sign(_old_minus_new(lo)) == -np.sign(_old_minus_new(hi)) != 0
+
+
+def test_sweep_without_crossing(client, auth):
+    # No deductions: the new regime is never worse
+    body = _sweep(client, auth, axes=[{"field": "salary", "stop": 5000000, "points": 101}]).json()
+    assert body["break_even"] == []
+    assert all(old >= new for old, new in zip(body["old_regime"], body["new_regime"]))
+
+
+def test_sweep_two_axes(client, auth):
+    body = _sweep(client, auth, deduction_data=DEDUCTIONS, axes=[
+        {"field": "salary", "stop": 5000000, "points": 51},
+        {"field": "section_80c", "stop": 150000, "points": 4},
+    ]).json()
+    assert np.shape(body["old_regime"]) == np.shape(body["new_regime"]) == (51, 4)
+    assert len(body["break_even"]) == 4
+    comparison = compare_regimes(IncomeData(salary=1000000), DeductionData(**{**DEDUCTIONS, "section_80c": 50000}))
+    assert body["old_regime"][10][1] == comparison.old_regime.total_tax
+
+
+def test_sweep_rejects_bad_requests(client, auth, monkeypatch):
+    assert _sweep(client, auth, axes=[{"field": "lottery", "stop": 10}]).status_code == 422
+    assert _sweep(client, auth, axes=[{"field": "salary", "stop": 10}] * 2).status_code == 422
+
+    monkeypatch.setattr(settings, "SWEEP_MAX_POINTS", 100)
+    assert _sweep(client, auth, axes=[
+        {"field": "salary", "stop": 10, "points": 11}, {"field": "section_80c", "stop": 10, "points": 10},
+    ]).status_code == 413
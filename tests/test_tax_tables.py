@@ -0,0 +1,73 @@
+"""Compiled slab and surcharge tables against the loops they replaced."""
+
+import random
+
+import pytest
+
+from backend.services.tax_rules import _RULE_SPECS, SUPPORTED_FINANCIAL_YEARS, get_rules
+
+_INF = float("inf")
+
+
+def _legacy_slab_tax(slabs: list[tuple[float, float]], rebate_limit: float, rebate: float, taxable_income: float) -> float:
+    """The per-slab walk `_calculate_old_regime_tax` / `_calculate_new_regime_tax` used to do."""
+    tax = 0.0
+    prev = 0
+    for limit, rate in slabs:
+        if taxable_income <= prev:
+            break
+        slab_income = min(taxable_income, limit) - prev
+        tax += slab_income * rate
+        prev = limit
+    if taxable_income <= rebate_limit:
+        tax = max(0, tax - rebate)
+    return tax
+
+
+def _legacy_surcharge(tax: float, taxable_income: float) -> float:
+    """The if/elif chain `_calculate_surcharge` used to be."""
+    if taxable_income <= 5000000:
+        return 0
+    elif taxable_income <= 10000000:
+        return tax * 0.10
+    elif taxable_income <= 20000000:
+        return tax * 0.15
+    elif taxable_income <= 50000000:
+        return tax * 0.25
+    else:
+        return tax * 0.37
+
+
+def _incomes(breakpoints: list[float], seed: int) -> list[float]:
+    """Every breakpoint, ±1 and ±0.01 around it, and a seeded random sample."""
+    values = [0.0, 0.01, 1.0]
+    for point in breakpoints:
+        values += [point, point - 1, point + 1, point - 0.01, point + 0.01]
+    rng = random.Random(seed)
+    values += [round(rng.uniform(0, 80_000_000), rng.choice((0, 2))) for _ in range(5000)]
+    values += [round(rng.uniform(0, 3_000_000), 2) for _ in range(5000)]
+    return [v for v in values if v >= 0]
+
+
+@pytest.mark.parametrize("financial_year", SUPPORTED_FINANCIAL_YEARS)
+@pytest.mark.parametrize("regime", ["old", "new"])
+def test_slab_table_matches_loop(financial_year, regime):
+    spec = _RULE_SPECS[financial_year]
+    slabs = spec[f"{regime}_slabs"]
+    rebate_limit, rebate = spec[f"{regime}_rebate"]
+    table = getattr(get_rules(financial_year), f"{regime}_slabs")
+
+    breakpoints = [limit for limit, _ in slabs if limit != _INF] + [rebate_limit]
+    for income in _incomes(breakpoints, seed=len(slabs)):
+        expected = _legacy_slab_tax(slabs, rebate_limit, rebate, income)
+        assert table.tax(income) == pytest.approx(expected, rel=1e-12, abs=1e-6), income
+        assert round(table.tax(income), 2) == round(expected, 2), income
+
+
+@pytest.mark.parametrize("financial_year", SUPPORTED_FINANCIAL_YEARS)
+def test_surcharge_table_matches_chain(financial_year):
+    table = get_rules(financial_year).surcharge
+    slabs = get_rules(financial_year).new_slabs
+    for income in _incomes(list(table.limits), seed=7):
+        tax = slabs.tax(income)
+        assert table.surcharge(tax, income) == _legacy_surcharge(tax, income), income
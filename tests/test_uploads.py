@@ -0,0 +1,145 @@
+"""Streaming multipart uploads: limits, hashing, malformed bodies and temp-file cleanup."""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
+from starlette.requests import Request
+
+from backend.utils import uploads
+from backend.utils.uploads import receive_upload, receive_uploads
+
+BOUNDARY = b"test-boundary"
+
+
+def _part(name: str, content: bytes, filename: str | None = None, content_type: str = "application/pdf") -> bytes:
+    disposition = f'form-data; name="{name}"' + (f'; filename="{filename}"' if filename else "")
+    headers = f"Content-Disposition: {disposition}\r\n"
+    if filename:
+        headers += f"Content-Type: {content_type}\r\n"
+    return b"--" + BOUNDARY + b"\r\n" + headers.encode() + b"\r\n" + content + b"\r\n"
+
+
+def _body(*parts: bytes) -> bytes:
+    return b"".join(parts) + b"--" + BOUNDARY + b"--\r\n"
+
+
+class _Stream:
+    """ASGI receive() handing the body over in chunks, counting how many were read."""
+
+    def __init__(self, body: bytes, chunk: int = 4096):
+        self.chunks = [body[i:i + chunk] for i in range(0, len(body), chunk)] or [b""]
+        self.read = 0
+
+    async def __call__(self):
+        self.read += 1
+        more = self.read < len(self.chunks)
+        return {"type": "http.request", "body": self.chunks[self.read - 1], "more_body": more}
+
+
+def _request(stream: _Stream, content_type: bytes = b"multipart/form-data; boundary=" + BOUNDARY,
+             content_length: int | None = None) -> Request:
+    headers = [(b"content-type", content_type)]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    return Request({"type": "http", "method": "POST", "headers": headers}, stream)
+
+
+def _receive(body: bytes, directory, batch: bool = False, **request_options):
+    stream = _Stream(body)
+    receive = receive_uploads if batch else receive_upload
+    return asyncio.run(receive(_request(stream, **request_options), str(directory))), stream
+
+
+@pytest.fixture(autouse=True)
+def small_limits(monkeypatch):
+    monkeypatch.setattr(uploads.settings, "MAX_UPLOAD_SIZE", 64 * 1024)
+    monkeypatch.setattr(uploads.settings, "MAX_BATCH_UPLOAD_SIZE", 96 * 1024)
+    monkeypatch.setattr(uploads.settings, "UPLOAD_BATCH_MAX_FILES", 3)
+    monkeypatch.setattr(uploads.settings, "UPLOAD_CHUNK_SIZE", 1024)
+
+
+def test_file_size_and_hash(tmp_path):
+    content = os.urandom(50_000) + b"\r\n--test-boundar" + os.urandom(1000)  # boundary look-alike inside
+    upload, _ = _receive(_body(_part("doc_type", b"form16"), _part("file", content, "f.pdf")), tmp_path)
+
+    assert upload.fields == {"doc_type": "form16"}
+    assert (upload.filename, upload.content_type) == ("f.pdf", "application/pdf")
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    with open(upload.temp_path, "rb") as f:
+        assert f.read() == content
+
+
+def test_batch_files_each_hashed(tmp_path):
+    contents = [os.urandom(20_000), b"", os.urandom(3)]
+    parts = [_part("files", content, f"{i}.pdf") for i, content in enumerate(contents)]
+    received, _ = _receive(_body(*parts, _part("doc_type", b"other")), tmp_path, batch=True)
+
+    assert [(u.filename, u.size, u.sha256) for u in received] == [
+        (f"{i}.pdf", len(content), hashlib.sha256(content).hexdigest()) for i, content in enumerate(contents)
+    ]
+    assert all(u.fields == {"doc_type": "other"} for u in received)
+
+
+def _rejected(body: bytes, directory, status: int, batch: bool = False, **request_options) -> _Stream:
+    stream = _Stream(body)
+    receive = receive_uploads if batch else receive_upload
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive(_request(stream, **request_options), str(directory)))
+    assert exc.value.status_code == status
+    assert os.listdir(directory) == []  # every temp file removed
+    return stream
+
+
+def test_declared_oversize_refused_before_reading(tmp_path):
+    body = _body(_part("file", b"x" * 100_000, "big.pdf"))
+    stream = _rejected(body, tmp_path, 413, content_length=len(body) + uploads._FORM_OVERHEAD)
+    assert stream.read == 0
+
+
+def test_oversize_stream_aborts_early(tmp_path):
+    body = _body(_part("file", b"x" * 1_000_000, "big.pdf"))
+    stream = _rejected(body, tmp_path, 413)
+    assert stream.read < len(stream.chunks) // 4
+
+
+def test_batch_total_limit(tmp_path):
+    parts = [_part("files", b"x" * 60_000, f"{i}.pdf") for i in range(2)]
+    _rejected(_body(*parts), tmp_path, 413, batch=True)
+
+
+def test_too_many_files(tmp_path):
+    parts = [_part("files", b"x", f"{i}.pdf") for i in range(4)]
+    _rejected(_body(*parts), tmp_path, 400, batch=True)
+
+
+def test_file_in_wrong_field(tmp_path):
+    _rejected(_body(_part("attachment", b"x", "a.pdf")), tmp_path, 400)
+
+
+def test_missing_file_field(tmp_path):
+    with pytest.raises(RequestValidationError):
+        _receive(_body(_part("doc_type", b"form16")), tmp_path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_truncated_body(tmp_path):
+    body = _body(_part("file", os.urandom(10_000), "a.pdf"))
+    _rejected(body[:-200], tmp_path, 400)
+    _rejected(body[: len(body) // 2], tmp_path, 400)
+
+
+def test_malformed_body(tmp_path):
+    _rejected(b"--wrong-boundary\r\n" + os.urandom(5000), tmp_path, 400)
+
+
+def test_oversized_form_field(tmp_path):
+    _rejected(_body(_part("doc_type", b"x" * 100_000), _part("file", b"x", "a.pdf")), tmp_path, 413)
+
+
+def test_not_multipart(tmp_path):
+    _rejected(b"{}", tmp_path, 415, content_type=b"application/json")